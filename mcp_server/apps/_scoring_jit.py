@@ -0,0 +1,92 @@
+"""Optional numba-compiled kernels for the scoring hot path.
+
+When numba is installed the proximity scan and the score-combine loop run
+as native code; otherwise the same functions execute as plain Python/NumPy,
+so scoring behaves identically either way.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency check
+    from numba import njit
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    njit = None  # type: ignore[assignment]
+
+
+def _near_scan(pos_g0: np.ndarray, pos_g1: np.ndarray, near_window: int) -> bool:
+    j = 0
+    n1 = pos_g1.shape[0]
+    for k in range(pos_g0.shape[0]):
+        i = pos_g0[k]
+        # advance j to keep pos_g1[j] close to i
+        while j + 1 < n1 and abs(pos_g1[j + 1] - i) <= abs(pos_g1[j] - i):
+            j += 1
+        if abs(pos_g1[j] - i) <= near_window:
+            return True
+    return False
+
+
+def _combine_scores(
+    v: np.ndarray,
+    fts_signal: np.ndarray,
+    phrase_bonus: np.ndarray,
+    proximity_bonus: np.ndarray,
+    coverage: np.ndarray,
+    weight_vector: float,
+    weight_fts: float,
+    weight_term_coverage: float,
+) -> np.ndarray:
+    out = np.empty(v.shape[0], dtype=np.float64)
+    for i in range(v.shape[0]):
+        total = (
+            weight_vector * v[i]
+            + weight_fts * fts_signal[i]
+            + phrase_bonus[i]
+            + proximity_bonus[i]
+            + weight_term_coverage * coverage[i]
+        )
+        if total < 0.0:
+            total = 0.0
+        elif total > 1.0:
+            total = 1.0
+        out[i] = total
+    return out
+
+
+def _combine_scores_numpy(
+    v: np.ndarray,
+    fts_signal: np.ndarray,
+    phrase_bonus: np.ndarray,
+    proximity_bonus: np.ndarray,
+    coverage: np.ndarray,
+    weight_vector: float,
+    weight_fts: float,
+    weight_term_coverage: float,
+) -> np.ndarray:
+    return np.clip(
+        weight_vector * v
+        + weight_fts * fts_signal
+        + phrase_bonus
+        + proximity_bonus
+        + weight_term_coverage * coverage,
+        0.0,
+        1.0,
+    )
+
+
+if njit is not None:  # pragma: no cover - exercised only with numba installed
+    near_scan = njit(cache=True)(_near_scan)
+    combine_scores = njit(cache=True, fastmath=True)(_combine_scores)
+    # Warm both kernels once so the first real query does not pay the
+    # compile; the cached machine code makes this cheap on later runs.
+    _dummy = np.zeros(1, dtype=np.float64)
+    combine_scores(_dummy, _dummy, _dummy, _dummy, _dummy, 0.6, 0.4, 0.2)
+    near_scan(np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.int32), 1)
+else:
+    near_scan = _near_scan
+    combine_scores = _combine_scores_numpy
+
+
+__all__ = ["combine_scores", "near_scan"]
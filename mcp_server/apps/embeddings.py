@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
-import json
+import math
+import os
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
-from .models import HadithDocument
+import numpy as np
+
+from . import jsonio
+from .encoder_registry import get_encoder
+from .models import HadithDocument, HadithRecord
 from .validation import validate_book
 
 try:  # pragma: no cover - optional dependency check
@@ -29,6 +37,26 @@ class EmbeddingDependencyError(RuntimeError):
     """Raised when optional embedding dependencies are unavailable."""
 
 
+
+
+# Batches below this size are cheaper to encode in-process than to ship
+# through a multi-process pool.
+_MULTI_PROCESS_THRESHOLD = 512
+
+
+# Streamed upserts encode and flush in chunks of this size to cap peak memory.
+_UPSERT_BATCH_SIZE = 1000
+
+
+def _default_device() -> str:
+    try:
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except Exception:  # pragma: no cover - torch ships with sentence-transformers
+        return "cpu"
+
+
 @dataclass
 class EmbeddingUpdateResult:
     processed: int
@@ -37,13 +65,21 @@ class EmbeddingUpdateResult:
     duration_seconds: float
 
 
-def _document_id(doc: HadithDocument) -> str:
-    return f"{doc.collection_slug}:{doc.book_id}:{doc.hadith_id_site}"
+@lru_cache(maxsize=65536)
+def _document_id_cached(slug: str, book_id: str, hadith_id: str) -> str:
+    return f"{slug}:{book_id}:{hadith_id}"
 
 
-def _render_document(doc: HadithDocument) -> str:
-    english = next((t.content for t in doc.texts if t.language == "en"), "")
-    arabic = next((t.content for t in doc.texts if t.language == "ar"), "")
+def _document_id(doc: HadithDocument | HadithRecord) -> str:
+    # Same ids recur across idempotent re-ingests; serve the cached
+    # interned string rather than re-formatting it each pass.
+    return _document_id_cached(doc.collection_slug, doc.book_id, doc.hadith_id_site)
+
+
+def _render_document(doc: HadithDocument | HadithRecord) -> str:
+    texts = doc.text_by_lang
+    english = texts.get("en", "")
+    arabic = texts.get("ar", "")
     narrator = doc.canonical_narrator or (doc.narrator or "")
     header = f"Narrator: {narrator}\n" if narrator else ""
     return f"{header}{english}\n\n{arabic}".strip()
@@ -57,18 +93,29 @@ class EmbeddingIndex:
         persist_directory: Path | str = Path("data/indexes/chroma"),
         collection_name: str = "hadith_documents",
         embedding_model: str = "all-MiniLM-L6-v2",
-        checksum_filename: str = "checksums.json",
+        checksum_filename: str = "checksums.sqlite",
         metadata_filename: str = "metadata.json",
+        embedding_dtype: str = "float32",
+        device: Optional[str] = None,
+        precision: str = "float32",
     ) -> None:
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
         self.embedding_model_name = embedding_model
+        # float16 halves the bytes handed to Chroma per vector; embeddings
+        # are normalized so cosine ranking is unaffected.
+        self.embedding_dtype = np.dtype(embedding_dtype)
+        self.device = device
+        self.precision = precision
+        self._encode_batch_size = 64
         self.checksum_path = self.persist_directory / checksum_filename
         self.metadata_path = self.persist_directory / metadata_filename
         self._checksum_cache: Dict[str, str] = {}
+        self._checksum_conn: Optional[sqlite3.Connection] = None
         self._client = None
         self._collection: Optional[Collection] = None
         self._model: Optional[SentenceTransformer] = None  # type: ignore[assignment]
+        self._pool: Optional[Dict[str, object]] = None
         self._dependency_error: Optional[str] = None
 
         self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -101,7 +148,7 @@ class EmbeddingIndex:
 
         if self.metadata_path.exists():
             try:
-                payload = json.loads(self.metadata_path.read_text(encoding="utf-8"))
+                payload = jsonio.loads(self.metadata_path.read_bytes())
                 last_updated = payload.get("last_updated")
             except Exception:  # pragma: no cover - defensive
                 last_updated = None
@@ -120,7 +167,7 @@ class EmbeddingIndex:
 
     def upsert_documents(
         self,
-        documents: Iterable[HadithDocument],
+        documents: Iterable[HadithDocument | HadithRecord],
         force: bool = False,
     ) -> EmbeddingUpdateResult:
         if not self.dependencies_ok() or self._collection is None:
@@ -135,11 +182,17 @@ class EmbeddingIndex:
         metadatas: List[Dict[str, object]] = []
         to_cache: Dict[str, str] = {}
         skipped = 0
+        inserted = 0
 
+        # Bind the cache probe once; on idempotent re-runs the loop body is
+        # little more than this dict lookup per document. Pending rows are
+        # encoded and flushed in chunks so huge ingests stay O(batch) in
+        # memory instead of O(corpus).
+        cached_checksum = self._checksum_cache.get
         for doc in documents:
             doc_id = _document_id(doc)
             checksum = doc.checksum or ""
-            if not force and checksum and self._checksum_cache.get(doc_id) == checksum:
+            if not force and checksum and cached_checksum(doc_id) == checksum:
                 skipped += 1
                 continue
 
@@ -158,15 +211,31 @@ class EmbeddingIndex:
             if checksum:
                 to_cache[doc_id] = checksum
 
-        if not ids:
-            duration = time.perf_counter() - start
-            return EmbeddingUpdateResult(
-                processed=skipped,
-                inserted=0,
-                skipped=skipped,
-                duration_seconds=duration,
-            )
+            if len(ids) >= _UPSERT_BATCH_SIZE:
+                inserted += self._flush_pending(ids, payloads, metadatas, to_cache)
+                ids, payloads, metadatas, to_cache = [], [], [], {}
 
+        if ids:
+            inserted += self._flush_pending(ids, payloads, metadatas, to_cache)
+
+        if inserted:
+            self._write_metadata()
+
+        duration = time.perf_counter() - start
+        return EmbeddingUpdateResult(
+            processed=skipped + inserted,
+            inserted=inserted,
+            skipped=skipped,
+            duration_seconds=duration,
+        )
+
+    def _flush_pending(
+        self,
+        ids: List[str],
+        payloads: List[str],
+        metadatas: List[Dict[str, object]],
+        to_cache: Dict[str, str],
+    ) -> int:
         embeddings = self._encode(payloads)
         self._collection.upsert(
             ids=ids,
@@ -174,18 +243,9 @@ class EmbeddingIndex:
             metadatas=metadatas,
             embeddings=embeddings,
         )
-
         self._checksum_cache.update(to_cache)
-        self._save_checksum_cache()
-        self._write_metadata()
-
-        duration = time.perf_counter() - start
-        return EmbeddingUpdateResult(
-            processed=skipped + len(ids),
-            inserted=len(ids),
-            skipped=skipped,
-            duration_seconds=duration,
-        )
+        self._save_checksum_cache(to_cache)
+        return len(ids)
 
     def upsert_books(
         self,
@@ -198,13 +258,15 @@ class EmbeddingIndex:
         total_inserted = 0
         total_skipped = 0
 
-        data_path = Path(data_dir)
-        for path in _resolve_book_paths(data_path, book_ids):
-            records, _ = validate_book(path)
-            result = self.upsert_documents(records, force=force)
-            total_processed += result.processed
-            total_inserted += result.inserted
-            total_skipped += result.skipped
+        paths = _resolve_book_paths(Path(data_dir), book_ids)
+        # Validate books on worker threads so JSON parsing of the next book
+        # overlaps with encoding of the current one.
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            for records, _ in executor.map(validate_book, paths):
+                result = self.upsert_documents(records, force=force)
+                total_processed += result.processed
+                total_inserted += result.inserted
+                total_skipped += result.skipped
 
         duration = time.perf_counter() - start
         return EmbeddingUpdateResult(
@@ -229,36 +291,115 @@ class EmbeddingIndex:
         except Exception as exc:  # pragma: no cover - defensive
             self._dependency_error = f"Failed to initialise ChromaDB client: {exc}"
 
+    def _checksum_db(self) -> sqlite3.Connection:
+        if self._checksum_conn is None:
+            conn = sqlite3.connect(str(self.checksum_path))
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cs ("
+                "doc_id TEXT PRIMARY KEY,"
+                "checksum TEXT"
+                ") WITHOUT ROWID"
+            )
+            conn.commit()
+            self._checksum_conn = conn
+        return self._checksum_conn
+
     def _load_checksum_cache(self) -> None:
-        if self.checksum_path.exists():
-            try:
-                self._checksum_cache = json.loads(
-                    self.checksum_path.read_text(encoding="utf-8")
-                )
-            except Exception:  # pragma: no cover - defensive
-                self._checksum_cache = {}
+        try:
+            conn = self._checksum_db()
+            self._checksum_cache = dict(
+                conn.execute("SELECT doc_id, checksum FROM cs")
+            )
+        except Exception:  # pragma: no cover - defensive
+            self._checksum_cache = {}
+            return
+        if not self._checksum_cache:
+            self._migrate_legacy_checksums(conn)
 
-    def _save_checksum_cache(self) -> None:
-        self.checksum_path.write_text(
-            json.dumps(self._checksum_cache, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+    def _migrate_legacy_checksums(self, conn: sqlite3.Connection) -> None:
+        legacy_path = self.persist_directory / "checksums.json"
+        if not legacy_path.exists():
+            return
+        try:
+            legacy = jsonio.loads(legacy_path.read_bytes())
+        except Exception:  # pragma: no cover - defensive
+            return
+        if legacy:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cs (doc_id, checksum) VALUES (?, ?)",
+                list(legacy.items()),
+            )
+            conn.commit()
+            self._checksum_cache = dict(legacy)
+
+    def _save_checksum_cache(self, delta: Dict[str, str]) -> None:
+        # Only the documents that actually changed hit disk, instead of
+        # rewriting the whole cache as JSON after every batch.
+        if not delta:
+            return
+        conn = self._checksum_db()
+        conn.executemany(
+            "INSERT INTO cs (doc_id, checksum) VALUES (?, ?) "
+            "ON CONFLICT(doc_id) DO UPDATE SET checksum=excluded.checksum",
+            list(delta.items()),
         )
+        conn.commit()
 
     def _write_metadata(self) -> None:
         payload = {
             "model": self.embedding_model_name,
             "last_updated": datetime.now(timezone.utc).isoformat(),
         }
-        self.metadata_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        self.metadata_path.write_bytes(jsonio.dumps_indented(payload))
 
-    def _encode(self, payloads: List[str]) -> List[List[float]]:
+    def _encode(self, payloads: List[str]) -> np.ndarray:
         model = self._ensure_model()
-        # Convert to plain lists to avoid dependency on numpy exporting
-        vectors = model.encode(payloads, convert_to_numpy=True)
-        return [vector.tolist() for vector in vectors]
+        # Sort payloads by length so each mini-batch pads to similar token
+        # counts (smart batching), then restore the original order after
+        # encoding. Chroma accepts the ndarray directly.
+        order = np.argsort([len(payload) for payload in payloads])
+        sorted_payloads = [payloads[i] for i in order]
+        if len(sorted_payloads) >= _MULTI_PROCESS_THRESHOLD:
+            pool = self._get_pool()
+            workers = len(pool["processes"])
+            vectors = model.encode_multi_process(
+                sorted_payloads,
+                pool,
+                batch_size=self._encode_batch_size,
+                chunk_size=min(5000, math.ceil(len(sorted_payloads) / (workers * 10))),
+                normalize_embeddings=True,
+            )
+        else:
+            vectors = model.encode(
+                sorted_payloads,
+                batch_size=self._encode_batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+                normalize_embeddings=True,
+            )
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return vectors[inverse].astype(self.embedding_dtype, copy=False)
+
+    def _get_pool(self) -> Dict[str, object]:
+        if self._pool is None:
+            self._pool = self._ensure_model().start_multi_process_pool()
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the multi-process encode pool and release the checksum DB."""
+        if self._pool is not None and self._model is not None:
+            try:
+                self._model.stop_multi_process_pool(self._pool)
+            finally:
+                self._pool = None
+        if self._checksum_conn is not None:
+            try:
+                self._checksum_conn.close()
+            finally:
+                self._checksum_conn = None
 
     def _ensure_model(self) -> SentenceTransformer:
         if SentenceTransformer is None:
@@ -266,12 +407,17 @@ class EmbeddingIndex:
                 "sentence-transformers is not installed; install to generate embeddings"
             )
         if self._model is None:
+            name = self.embedding_model_name
+            device = self.device or os.environ.get("SBERT_DEVICE") or _default_device()
             try:
-                self._model = SentenceTransformer(self.embedding_model_name)
+                model = get_encoder(name, device=device, precision=self.precision)
             except Exception as exc:  # pragma: no cover - defensive
                 raise EmbeddingDependencyError(
-                    f"Failed to load embedding model '{self.embedding_model_name}': {exc}"
+                    f"Failed to load embedding model '{name}': {exc}"
                 ) from exc
+            # Larger batches keep a GPU saturated; CPU prefers smaller ones.
+            self._encode_batch_size = 128 if device.startswith("cuda") else 64
+            self._model = model
         return self._model
 
     def query(self, query_text: str, n_results: int = 20) -> List[Dict[str, object]]:
@@ -285,35 +431,36 @@ class EmbeddingIndex:
         if not self.dependencies_ok() or self._collection is None:
             return []
         try:
-            # Embed query locally for consistent scoring with upserted vectors
+            # Embed query locally for consistent scoring with upserted vectors.
+            # Stored vectors are unit-normalized at upsert, so normalize here
+            # too and spare the index its own norm pass per query.
             model = self._ensure_model()
-            qvec = model.encode([query_text], convert_to_numpy=True)
+            qvec = model.encode(
+                [query_text], convert_to_numpy=True, normalize_embeddings=True
+            )
             res = self._collection.query(
-                query_embeddings=qvec.tolist(),
+                query_embeddings=qvec.astype(np.float32, copy=False),
                 n_results=int(n_results),
                 include=["distances", "metadatas"],
             )
-            ids = res.get("ids", [[]])[0]
-            distances = res.get("distances", [[]])[0]
-            metadatas = res.get("metadatas", [[]])[0]
+            ids = res.get("ids", [[]])[0] or []
+            distances = res.get("distances", [[]])[0] or []
+            metadatas = res.get("metadatas", [[]])[0] or []
+            # Normalize all distances to similarity in one vectorized pass
+            # instead of per-hit Python float math.
+            dists = np.asarray(distances[: len(ids)], dtype=np.float64)
+            valid = ~np.isnan(dists)
+            sims = np.where(
+                valid, 1.0 / (1.0 + np.maximum(np.nan_to_num(dists), 0.0)), 0.0
+            )
             out: List[Dict[str, object]] = []
-            for i, doc_id in enumerate(ids or []):
-                dist = None
-                if distances and i < len(distances):
-                    d = distances[i]
-                    try:
-                        dist = float(d) if d is not None else None
-                    except Exception:
-                        dist = None
-                sim = 0.0
-                if dist is not None:
-                    # Normalize distance to similarity in [0,1]
-                    sim = 1.0 / (1.0 + max(0.0, dist))
-                md = metadatas[i] if metadatas and i < len(metadatas) else {}
+            for i, doc_id in enumerate(ids):
+                has_dist = i < len(dists) and bool(valid[i])
+                md = metadatas[i] if i < len(metadatas) else {}
                 out.append({
                     "doc_id": doc_id,
-                    "similarity": sim,
-                    "distance": dist,
+                    "similarity": float(sims[i]) if has_dist else 0.0,
+                    "distance": float(dists[i]) if has_dist else None,
                     "metadata": md or {},
                 })
             return out
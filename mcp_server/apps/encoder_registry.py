@@ -0,0 +1,63 @@
+"""Process-wide SentenceTransformer registry shared across corpora.
+
+The hadith and quran paths both use MiniLM-class encoders; loading the
+weights once per (model, device, precision) keeps a single ~90MB copy in
+memory no matter how many indexes are alive.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+try:  # pragma: no cover - optional dependency check
+    from sentence_transformers import SentenceTransformer
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    SentenceTransformer = None  # type: ignore[assignment]
+
+
+_MODEL_CACHE: Dict[str, "SentenceTransformer"] = {}
+
+
+def _cuda_selected(device: Optional[str]) -> bool:
+    if device:
+        return device.startswith("cuda")
+    try:
+        import torch
+
+        return bool(torch.cuda.is_available())
+    except Exception:
+        return False
+
+
+def get_encoder(
+    model_name: str,
+    device: Optional[str] = None,
+    precision: str = "float32",
+) -> "SentenceTransformer":
+    """Return the shared encoder for (model, device, precision).
+
+    Reduced precision is applied only when the model runs on CUDA; CPU
+    inference stays float32, where half floats are slower.
+    """
+    if SentenceTransformer is None:
+        raise RuntimeError(
+            "sentence-transformers is not installed; install to generate embeddings"
+        )
+    key = f"{model_name}@{device or 'default'}/{precision}"
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        model = (
+            SentenceTransformer(model_name, device=device)
+            if device
+            else SentenceTransformer(model_name)
+        )
+        if _cuda_selected(device):
+            if precision in ("float16", "fp16"):
+                model.half()
+            elif precision in ("bfloat16", "bf16"):
+                model.bfloat16()
+        _MODEL_CACHE[key] = model
+    return model
+
+
+__all__ = ["get_encoder"]
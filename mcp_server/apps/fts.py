@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional
-from .models import HadithDocument
+from . import jsonio
+from .models import HadithDocument, HadithRecord
 from .validation import validate_book
 
 
@@ -18,6 +20,10 @@ class FtsIndexError(RuntimeError):
     """Raised when the underlying SQLite database cannot support FTS features."""
 
 
+# Streamed upserts flush in batches of this size to cap peak memory.
+_UPSERT_BATCH_SIZE = 1000
+
+
 @dataclass
 class FtsUpdateResult:
     processed: int
@@ -26,16 +32,15 @@ class FtsUpdateResult:
     duration_seconds: float
 
 
-def _document_id(doc: HadithDocument) -> str:
-    return f"{doc.collection_slug}:{doc.book_id}:{doc.hadith_id_site}"
-
+@lru_cache(maxsize=65536)
+def _document_id_cached(slug: str, book_id: str, hadith_id: str) -> str:
+    return f"{slug}:{book_id}:{hadith_id}"
 
-def _english_text(doc: HadithDocument) -> str:
-    return next((t.content for t in doc.texts if t.language == "en"), "")
 
-
-def _arabic_text(doc: HadithDocument) -> str:
-    return next((t.content for t in doc.texts if t.language == "ar"), "")
+def _document_id(doc: HadithDocument | HadithRecord) -> str:
+    # Re-ingest runs see the same ids repeatedly; the cache returns the
+    # interned string instead of re-formatting it.
+    return _document_id_cached(doc.collection_slug, doc.book_id, doc.hadith_id_site)
 
 
 class FTSIndex:
@@ -50,6 +55,9 @@ class FTSIndex:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.metadata_path = self.db_path.parent / metadata_filename
         self._dependency_error: Optional[str] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._in_stmt_cache: Dict[int, str] = {}
         self._initialise()
 
     # public API -------------------------------------------------
@@ -63,7 +71,7 @@ class FTSIndex:
 
         if self.metadata_path.exists():
             try:
-                payload = json.loads(self.metadata_path.read_text(encoding="utf-8"))
+                payload = jsonio.loads(self.metadata_path.read_bytes())
                 last_updated = payload.get("last_updated")
             except Exception:  # pragma: no cover - defensive
                 last_updated = None
@@ -106,18 +114,28 @@ class FTSIndex:
     def get_by_doc_ids(self, ids: List[str]) -> Dict[str, Dict[str, object]]:
         if not ids:
             return {}
-        placeholders = ",".join("?" for _ in ids)
-        sql = (
-            f"SELECT doc_id, book_id, chapter_id, narrator, english_text FROM hadith_fts "
-            f"WHERE doc_id IN ({placeholders})"
-        )
+        sql = self._in_sql(len(ids))
         with self._connect() as conn:
             rows = conn.execute(sql, ids).fetchall()
             return {row["doc_id"]: dict(row) for row in rows}
 
+    def _in_sql(self, n: int) -> str:
+        # Batch sizes recur (the hybrid handoff is almost always top-k), so
+        # cache the placeholder SQL per size and let SQLite reuse its
+        # prepared statement instead of parsing a fresh string each call.
+        sql = self._in_stmt_cache.get(n)
+        if sql is None:
+            placeholders = ",".join("?" * n)
+            sql = (
+                "SELECT doc_id, book_id, chapter_id, narrator, english_text FROM hadith_fts "
+                f"WHERE doc_id IN ({placeholders})"
+            )
+            self._in_stmt_cache[n] = sql
+        return sql
+
     def upsert_documents(
         self,
-        documents: Iterable[HadithDocument],
+        documents: Iterable[HadithDocument | HadithRecord],
         force: bool = False,
     ) -> FtsUpdateResult:
         if not self.dependencies_ok():
@@ -127,64 +145,33 @@ class FTSIndex:
             )
 
         start = time.perf_counter()
-        docs = list(documents)
-        if not docs:
-            return FtsUpdateResult(processed=0, inserted=0, skipped=0, duration_seconds=0.0)
-
-        ids = [_document_id(doc) for doc in docs]
-        checksums = {doc_id: doc.checksum or "" for doc_id, doc in zip(ids, docs)}
+        processed = 0
         skipped = 0
         inserted = 0
 
-        with self._connect() as conn:
-            existing = self._fetch_existing_checksums(conn, ids)
-            for doc_id, doc in zip(ids, docs):
-                checksum = checksums[doc_id]
-                if not force and checksum and existing.get(doc_id) == checksum:
-                    skipped += 1
-                    continue
-
-                english_text = _english_text(doc)
-                arabic_text = _arabic_text(doc)
-                narrator = doc.canonical_narrator or doc.narrator or ""
-                conn.execute(
-                    "INSERT INTO documents (doc_id, collection_slug, book_id, chapter_id, narrator, checksum) "
-                    "VALUES (?, ?, ?, ?, ?, ?) "
-                    "ON CONFLICT(doc_id) DO UPDATE SET "
-                    "collection_slug=excluded.collection_slug, "
-                    "book_id=excluded.book_id, "
-                    "chapter_id=excluded.chapter_id, "
-                    "narrator=excluded.narrator, "
-                    "checksum=excluded.checksum",
-                    (
-                        doc_id,
-                        doc.collection_slug,
-                        doc.book_id,
-                        doc.chapter_id,
-                        narrator,
-                        checksum,
-                    ),
-                )
-                conn.execute("DELETE FROM hadith_fts WHERE doc_id = ?", (doc_id,))
-                conn.execute(
-                    "INSERT INTO hadith_fts (doc_id, english_text, arabic_text, narrator, book_id, chapter_id) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    (
-                        doc_id,
-                        english_text,
-                        arabic_text,
-                        narrator,
-                        doc.book_id,
-                        doc.chapter_id,
-                    ),
-                )
-                inserted += 1
+        # Stream the iterable in fixed-size batches so a multi-book ingest
+        # never holds more than one batch of documents in memory, while each
+        # batch still gets the executemany + temp-join treatment.
+        with self._connect(write=True) as conn:
+            batch: List[HadithDocument | HadithRecord] = []
+            for doc in documents:
+                batch.append(doc)
+                if len(batch) >= _UPSERT_BATCH_SIZE:
+                    batch_inserted, batch_skipped = self._upsert_batch(conn, batch, force)
+                    processed += len(batch)
+                    inserted += batch_inserted
+                    skipped += batch_skipped
+                    batch = []
+            if batch:
+                batch_inserted, batch_skipped = self._upsert_batch(conn, batch, force)
+                processed += len(batch)
+                inserted += batch_inserted
+                skipped += batch_skipped
 
         if inserted:
             self._write_metadata()
 
-        duration = time.perf_counter() - start
-        processed = len(docs)
+        duration = time.perf_counter() - start if processed else 0.0
         return FtsUpdateResult(
             processed=processed,
             inserted=inserted,
@@ -192,6 +179,73 @@ class FTSIndex:
             duration_seconds=duration,
         )
 
+    def _upsert_batch(
+        self,
+        conn: sqlite3.Connection,
+        docs: List[HadithDocument | HadithRecord],
+        force: bool,
+    ) -> tuple[int, int]:
+        ids = [_document_id(doc) for doc in docs]
+        checksums = {doc_id: doc.checksum or "" for doc_id, doc in zip(ids, docs)}
+        changed = self._changed_doc_ids(conn, ids, checksums, force)
+
+        skipped = 0
+        doc_rows: List[tuple] = []
+        fts_rows: List[tuple] = []
+        for doc_id, doc in zip(ids, docs):
+            if doc_id not in changed:
+                skipped += 1
+                continue
+            checksum = checksums[doc_id]
+
+            texts = doc.text_by_lang
+            narrator = doc.canonical_narrator or doc.narrator or ""
+            doc_rows.append(
+                (
+                    doc_id,
+                    doc.collection_slug,
+                    doc.book_id,
+                    doc.chapter_id,
+                    narrator,
+                    checksum,
+                )
+            )
+            fts_rows.append(
+                (
+                    doc_id,
+                    texts.get("en", ""),
+                    texts.get("ar", ""),
+                    narrator,
+                    doc.book_id,
+                    doc.chapter_id,
+                )
+            )
+
+        # One executemany per statement amortises SQL parsing and keeps
+        # the whole batch in the single surrounding transaction.
+        if doc_rows:
+            conn.executemany(
+                "INSERT INTO documents (doc_id, collection_slug, book_id, chapter_id, narrator, checksum) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(doc_id) DO UPDATE SET "
+                "collection_slug=excluded.collection_slug, "
+                "book_id=excluded.book_id, "
+                "chapter_id=excluded.chapter_id, "
+                "narrator=excluded.narrator, "
+                "checksum=excluded.checksum",
+                doc_rows,
+            )
+            conn.executemany(
+                "DELETE FROM hadith_fts WHERE doc_id = ?",
+                [(row[0],) for row in doc_rows],
+            )
+            conn.executemany(
+                "INSERT INTO hadith_fts (doc_id, english_text, arabic_text, narrator, book_id, chapter_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                fts_rows,
+            )
+        return len(doc_rows), skipped
+
     def seed_sample_book(self, book_id: str = "1", force: bool = False) -> FtsUpdateResult:
         paths = _resolve_book_paths(Path("data/riyadussalihin"), [book_id])
         if not paths:
@@ -229,21 +283,54 @@ class FTSIndex:
     # internal helpers ------------------------------------------
     def _initialise(self) -> None:
         try:
-            with self._connect() as conn:
+            with self._connect(write=True) as conn:
                 self._ensure_fts5(conn)
                 self._create_tables(conn)
         except FtsIndexError as exc:
             self._dependency_error = str(exc)
 
     @contextmanager
-    def _connect(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(str(self.db_path))
-        try:
-            conn.row_factory = sqlite3.Row
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        # Reuse one connection per thread so hot query loops (REPL, MCP
+        # server) skip the connect + pragma handshake on every call. Only
+        # write/DDL paths take the lock; reads run concurrently on their
+        # thread-local connections under WAL.
+        conn = self._thread_connection()
+        if not write:
             yield conn
-            conn.commit()
-        finally:  # pragma: no cover - connection cleanup
-            conn.close()
+            return
+        with self._lock:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error:  # pragma: no cover - stale handle
+                conn = None
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._apply_pragmas(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection) -> None:
+        # WAL + NORMAL turns the fsync-per-commit of bulk ingest into a
+        # single WAL append; the cache/mmap settings keep hot FTS pages in
+        # memory across queries.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
 
     def _ensure_fts5(self, conn: sqlite3.Connection) -> None:
         try:
@@ -261,6 +348,9 @@ class FTSIndex:
             raise FtsIndexError("SQLite build lacks FTS5 support") from exc
 
     def _create_tables(self, conn: sqlite3.Connection) -> None:
+        # WITHOUT ROWID stores the row data in the primary-key b-tree, so
+        # doc_id lookups read one page instead of an index hop plus a rowid
+        # fetch; the (doc_id, checksum) index keeps the skip join index-only.
         conn.execute(
             "CREATE TABLE IF NOT EXISTS documents ("
             "doc_id TEXT PRIMARY KEY,"
@@ -269,7 +359,10 @@ class FTSIndex:
             "chapter_id TEXT,"
             "narrator TEXT,"
             "checksum TEXT"
-            ")"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_docs_checksum ON documents(doc_id, checksum)"
         )
         conn.execute(
             "CREATE TABLE IF NOT EXISTS metadata ("
@@ -289,27 +382,39 @@ class FTSIndex:
             ")"
         )
 
-    def _fetch_existing_checksums(
-        self, conn: sqlite3.Connection, ids: List[str]
-    ) -> Dict[str, str]:
-        if not ids:
-            return {}
-        placeholders = ",".join("?" for _ in ids)
+    def _changed_doc_ids(
+        self,
+        conn: sqlite3.Connection,
+        ids: List[str],
+        checksums: Dict[str, str],
+        force: bool,
+    ) -> set[str]:
+        if force:
+            return set(ids)
+        # Let SQLite compute the set-diff against stored checksums in one
+        # join rather than probing a Python dict per document.
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS incoming (doc_id TEXT PRIMARY KEY, checksum TEXT)"
+        )
+        conn.execute("DELETE FROM incoming")
+        conn.executemany(
+            "INSERT OR REPLACE INTO incoming (doc_id, checksum) VALUES (?, ?)",
+            [(doc_id, checksums[doc_id]) for doc_id in ids],
+        )
         rows = conn.execute(
-            f"SELECT doc_id, checksum FROM documents WHERE doc_id IN ({placeholders})",
-            ids,
+            "SELECT i.doc_id FROM incoming i "
+            "LEFT JOIN documents d ON d.doc_id = i.doc_id "
+            "WHERE i.checksum = '' OR d.checksum IS NULL OR d.checksum != i.checksum"
         ).fetchall()
-        return {row["doc_id"]: row["checksum"] or "" for row in rows}
+        conn.execute("DELETE FROM incoming")
+        return {row[0] for row in rows}
 
     def _write_metadata(self) -> None:
         payload = {
             "last_updated": datetime.now(timezone.utc).isoformat(),
             "db_path": str(self.db_path),
         }
-        self.metadata_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        self.metadata_path.write_bytes(jsonio.dumps_indented(payload))
 
 
 __all__ = ["FTSIndex", "FtsUpdateResult", "FtsIndexError"]
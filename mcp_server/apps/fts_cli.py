@@ -16,34 +16,14 @@ import sys
 from typing import Optional, List
 
 from .fts import FTSIndex
+from .fts_query import build_match
 
 
-def _quote_if_needed(text: str) -> str:
-    t = text.strip()
-    if not t:
-        return t
-    # If already quoted, keep as-is
-    if (t.startswith('"') and t.endswith('"')) or (t.startswith("'") and t.endswith("'")):
-        return t
-    # Quote if contains whitespace or special chars
-    if any(c.isspace() for c in t):
-        return f'"{t}"'
-    return t
-
-
-def build_match(en: Optional[str], ar: Optional[str], narrator: Optional[str]) -> Optional[str]:
-    parts: List[str] = []
-    if en:
-        parts.append(f"english_text:{_quote_if_needed(en)}")
-    if ar:
-        parts.append(f"arabic_text:{_quote_if_needed(ar)}")
-    if narrator:
-        parts.append(f"narrator:{_quote_if_needed(narrator)}")
-    return " AND ".join(parts) if parts else None
-
-
-def run_match(match: str, limit: int, as_json: bool) -> int:
-    fts = FTSIndex()
+def run_match(match: str, limit: int, as_json: bool, fts: Optional[FTSIndex] = None) -> int:
+    # Accept a shared index so REPL loops skip re-running schema probes
+    # and pragma setup on every query.
+    if fts is None:
+        fts = FTSIndex()
     try:
         rows = fts.search_match(match, limit=limit)
     except Exception as exc:
@@ -83,6 +63,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     print("FTS REPL. Enter raw MATCH strings (or 'exit'). Examples:")
     print("  english_text:fast* AND book_id:8")
     print("  narrator:\"Abu Hurairah\" AND english_text:charity")
+    fts = FTSIndex()
     while True:
         try:
             line = input("fts> ").strip()
@@ -91,7 +72,7 @@ def main(argv: Optional[list[str]] = None) -> int:
             break
         if not line or line.lower() in {"exit", "quit", "q"}:
             break
-        run_match(line, args.limit, args.json)
+        run_match(line, args.limit, args.json, fts=fts)
     return 0
 
 
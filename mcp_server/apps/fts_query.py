@@ -0,0 +1,38 @@
+"""Shared helpers for building FTS MATCH expressions from field inputs."""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+_QUOTED_RE = re.compile(r"^(['\"]).*\1$")
+_WS_RE = re.compile(r"\s")
+
+
+def quote_if_needed(text: str) -> str:
+    t = text.strip()
+    if not t:
+        return t
+    # If already quoted, keep as-is
+    if _QUOTED_RE.match(t):
+        return t
+    # Quote if contains whitespace
+    if _WS_RE.search(t) is not None:
+        return f'"{t}"'
+    return t
+
+
+def build_match(
+    en: Optional[str], ar: Optional[str], narrator: Optional[str]
+) -> Optional[str]:
+    parts: List[str] = []
+    if en:
+        parts.append(f"english_text:{quote_if_needed(en)}")
+    if ar:
+        parts.append(f"arabic_text:{quote_if_needed(ar)}")
+    if narrator:
+        parts.append(f"narrator:{quote_if_needed(narrator)}")
+    return " AND ".join(parts) if parts else None
+
+
+__all__ = ["build_match", "quote_if_needed"]
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple, TYPE_CHECKING
 
+from . import jsonio
 from .models import BookStats
-from .validation import ValidationIssue, validate_book
+from .validation import ValidationIssue, book_stats_fast, validate_book
 
 
 DATA_DIR = Path("data/riyadussalihin")
@@ -39,6 +42,7 @@ def ingest_book(
     embedding_index: "EmbeddingIndex" | None = None,
     fts_index: "FTSIndex" | None = None,
     force_index: bool = False,
+    log_mode: str = "jsonl",
 ) -> Tuple[
     BookStats,
     Optional["EmbeddingUpdateResult"],
@@ -47,16 +51,20 @@ def ingest_book(
     start = time.perf_counter()
     records, stats = validate_book(path)
     duration = time.perf_counter() - start
-    print(stats.model_dump_json(indent=2))
-    print(f"Validated {len(records)} hadiths from {path.name} in {duration:.2f}s")
-    write_log(stats, len(records), duration)
+    # Collect the per-book report and emit it in one write: a corpus of
+    # small books otherwise pays a line-buffered flush per print.
+    lines = [
+        stats.model_dump_json(indent=2),
+        f"Validated {len(records)} hadiths from {path.name} in {duration:.2f}s",
+    ]
+    write_log(stats, len(records), duration, mode=log_mode)
 
     embedding_result = None
     fts_result = None
 
     if embedding_index is not None:
         embedding_result = embedding_index.upsert_documents(records, force=force_index)
-        print(
+        lines.append(
             "Embedding index -> processed: {processed}, inserted: {inserted}, skipped: {skipped}, duration: {duration:.2f}s".format(
                 processed=embedding_result.processed,
                 inserted=embedding_result.inserted,
@@ -67,7 +75,7 @@ def ingest_book(
 
     if fts_index is not None:
         fts_result = fts_index.upsert_documents(records, force=force_index)
-        print(
+        lines.append(
             "FTS index -> processed: {processed}, inserted: {inserted}, skipped: {skipped}, duration: {duration:.2f}s".format(
                 processed=fts_result.processed,
                 inserted=fts_result.inserted,
@@ -76,10 +84,24 @@ def ingest_book(
             )
         )
 
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     return stats, embedding_result, fts_result
 
 
-def write_log(stats: BookStats, record_count: int, duration: float) -> None:
+def _validate_only(path: Path) -> Tuple[BookStats, int, float]:
+    """Worker-friendly validation step returning picklable results."""
+    start = time.perf_counter()
+    records, stats = validate_book(path)
+    return stats, len(records), time.perf_counter() - start
+
+
+def write_log(
+    stats: BookStats,
+    record_count: int,
+    duration: float,
+    mode: str = "jsonl",
+) -> None:
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now(timezone.utc).isoformat().replace(":", "-")
     payload = {
@@ -88,9 +110,14 @@ def write_log(stats: BookStats, record_count: int, duration: float) -> None:
         "duration_seconds": round(duration, 3),
         "timestamp": timestamp,
     }
-    log_path = LOG_DIR / f"{stats.book_id}_{timestamp}.json"
-    with log_path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    if mode == "per-book":
+        log_path = LOG_DIR / f"{stats.book_id}_{timestamp}.json"
+        log_path.write_bytes(jsonio.dumps_indented(payload))
+        return
+    # One appended line per book: a full-corpus run touches a single file
+    # instead of creating hundreds of timestamped ones.
+    with (LOG_DIR / "ingestion.jsonl").open("ab") as handle:
+        handle.write(jsonio.dumps(payload) + b"\n")
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -110,12 +137,30 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Force reindexing even if checksums match (implies --update-indexes)",
     )
+    parser.add_argument(
+        "--stats-only",
+        action="store_true",
+        help="Report per-book stats via the columnar fast path; skips full validation and indexing",
+    )
+    parser.add_argument(
+        "--log-mode",
+        choices=("jsonl", "per-book"),
+        default="jsonl",
+        help="Append to logs/ingestion/ingestion.jsonl (default) or write per-book files",
+    )
     args = parser.parse_args(argv)
 
     try:
         paths = iter_book_paths(args.book)
         print(f"Processing {len(paths)} book(s) from {DATA_DIR}...\n")
 
+        if args.stats_only:
+            for path in paths:
+                stats = book_stats_fast(path)
+                sys.stdout.write(stats.model_dump_json(indent=2) + "\n" + "-" * 60 + "\n")
+            sys.stdout.flush()
+            return
+
         update_indexes = args.update_indexes or args.force_index_refresh
         embedding_index = None
         fts_index = None
@@ -126,56 +171,64 @@ def main(argv: list[str] | None = None) -> None:
             embedding_index = EmbeddingIndex()
             fts_index = FTSIndex()
 
-        embedding_totals = {
-            "processed": 0,
-            "inserted": 0,
-            "skipped": 0,
-            "duration": 0.0,
-        }
-        fts_totals = {
-            "processed": 0,
-            "inserted": 0,
-            "skipped": 0,
-            "duration": 0.0,
-        }
-
+        if not update_indexes and len(paths) > 1:
+            # Validation is CPU-bound (JSON parse + pydantic) and books are
+            # independent, so fan out across processes. Index updates stay
+            # on the main process because they share index state.
+            workers = min(len(paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for stats, count, duration in executor.map(_validate_only, paths):
+                    print(stats.model_dump_json(indent=2))
+                    print(
+                        f"Validated {count} hadiths from book {stats.book_id} in {duration:.2f}s"
+                    )
+                    write_log(stats, count, duration, mode=args.log_mode)
+                    print("-" * 60)
+            return
+
+        # Validate per book but collect every record so each index sees a
+        # single upsert: one FTS transaction and full-size encode batches
+        # instead of per-book commits.
+        all_records = []
         for path in paths:
-            _, embedding_result, fts_result = ingest_book(
-                path,
-                embedding_index=embedding_index,
-                fts_index=fts_index,
-                force_index=args.force_index_refresh,
+            start = time.perf_counter()
+            records, stats = validate_book(path)
+            duration = time.perf_counter() - start
+            sys.stdout.write(
+                stats.model_dump_json(indent=2)
+                + f"\nValidated {len(records)} hadiths from {path.name} in {duration:.2f}s\n"
+                + "-" * 60
+                + "\n"
             )
-            if embedding_result is not None:
-                embedding_totals["processed"] += embedding_result.processed
-                embedding_totals["inserted"] += embedding_result.inserted
-                embedding_totals["skipped"] += embedding_result.skipped
-                embedding_totals["duration"] += embedding_result.duration_seconds
-            if fts_result is not None:
-                fts_totals["processed"] += fts_result.processed
-                fts_totals["inserted"] += fts_result.inserted
-                fts_totals["skipped"] += fts_result.skipped
-                fts_totals["duration"] += fts_result.duration_seconds
-            print("-" * 60)
+            write_log(stats, len(records), duration, mode=args.log_mode)
+            if update_indexes:
+                all_records.extend(records)
+        sys.stdout.flush()
 
         if update_indexes:
             print("\nIndex update summary:")
+            embedding_result = embedding_index.upsert_documents(
+                all_records, force=args.force_index_refresh
+            )
             print(
                 "Embedding index totals -> processed: {processed}, inserted: {inserted}, "
                 "skipped: {skipped}, duration: {duration:.2f}s".format(
-                    processed=embedding_totals["processed"],
-                    inserted=embedding_totals["inserted"],
-                    skipped=embedding_totals["skipped"],
-                    duration=embedding_totals["duration"],
+                    processed=embedding_result.processed,
+                    inserted=embedding_result.inserted,
+                    skipped=embedding_result.skipped,
+                    duration=embedding_result.duration_seconds,
                 )
             )
+            fts_result = fts_index.upsert_documents(
+                all_records, force=args.force_index_refresh
+            )
             print(
                 "FTS index totals -> processed: {processed}, inserted: {inserted}, "
                 "skipped: {skipped}, duration: {duration:.2f}s".format(
-                    processed=fts_totals["processed"],
-                    inserted=fts_totals["inserted"],
-                    skipped=fts_totals["skipped"],
-                    duration=fts_totals["duration"],
+                    processed=fts_result.processed,
+                    inserted=fts_result.inserted,
+                    skipped=fts_result.skipped,
+                    duration=fts_result.duration_seconds,
                 )
             )
     except ValidationIssue as exc:
@@ -0,0 +1,41 @@
+"""JSON helpers that prefer orjson when it is installed.
+
+Metadata and cache files are read on every cold start; orjson parses and
+encodes them in C, while the stdlib fallback keeps the module dependency-free.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # pragma: no cover - optional dependency check
+    import orjson
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    orjson = None  # type: ignore[assignment]
+
+
+if orjson is not None:  # pragma: no cover - exercised only with orjson installed
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps_indented(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+else:
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def dumps_indented(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+__all__ = ["loads", "dumps", "dumps_indented"]
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -48,6 +49,10 @@ class HadithDocument(BaseModel):
         default=None,
         description="Normalized narrator name without honorifics or verbs.",
     )
+    text_by_lang: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Language code to content, derived once from texts.",
+    )
 
     model_config = {
         "extra": "ignore",
@@ -62,11 +67,44 @@ class HadithDocument(BaseModel):
         return value
 
     @model_validator(mode="after")
-    def set_canonical_narrator(self) -> "HadithDocument":
+    def set_derived_fields(self) -> "HadithDocument":
         self.canonical_narrator = extract_narrator_name(self.narrator)
+        self.text_by_lang = {segment.language: segment.content for segment in self.texts}
         return self
 
 
+@dataclass(slots=True, frozen=True)
+class HadithRecord:
+    """Lightweight post-validation twin of HadithDocument.
+
+    Carries only the fields the FTS and embedding indexes read. Slots drop
+    the per-instance dict and pydantic machinery, which matters when a full
+    corpus of records is held in memory for a single cross-book upsert.
+    """
+
+    collection_slug: str
+    book_id: str
+    chapter_id: str
+    hadith_id_site: str
+    narrator: Optional[str]
+    canonical_narrator: Optional[str]
+    checksum: Optional[str]
+    text_by_lang: Dict[str, str]
+
+    @classmethod
+    def from_document(cls, doc: "HadithDocument") -> "HadithRecord":
+        return cls(
+            collection_slug=doc.collection_slug,
+            book_id=doc.book_id,
+            chapter_id=doc.chapter_id,
+            hadith_id_site=doc.hadith_id_site,
+            narrator=doc.narrator,
+            canonical_narrator=doc.canonical_narrator,
+            checksum=doc.checksum,
+            text_by_lang=doc.text_by_lang,
+        )
+
+
 class BookStats(BaseModel):
     book_id: str
     total_hadith: int
@@ -87,6 +125,7 @@ __all__ = [
     "TextSegment",
     "Reference",
     "HadithDocument",
+    "HadithRecord",
     "BookStats",
     "IngestionResult",
 ]
@@ -3,25 +3,34 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional
 
-HONORIFICS_PATTERN = re.compile(
-    r"\((?:may|may allah be pleased|رضي الله عن(?:ه|ها|هم))[^)]*\)", re.IGNORECASE
+# Honorific parentheticals, reporting verbs, and stray punctuation fused
+# into one alternation so cleanup is a single sub pass.
+STRIP_PATTERN = re.compile(
+    r"\((?:may|may allah be pleased|رضي الله عن(?:ه|ها|هم))[^)]*\)"
+    r"|\b(?:reported|narrated|said|stated)\b:?"
+    r"|[:،]",
+    re.IGNORECASE,
 )
-VERB_PATTERN = re.compile(r"\b(reported|narrated|said|stated)\b:?", re.IGNORECASE)
 WHITESPACE_PATTERN = re.compile(r"\s+")
 
 
 def extract_narrator_name(raw: Optional[str]) -> Optional[str]:
-    """Return a canonical narrator name stripped of honorifics and verbs."""
+    """Return a canonical narrator name stripped of honorifics and verbs.
+
+    Narrator strings repeat heavily across a book, so the regex work is
+    cached per distinct input.
+    """
     if not raw:
         return None
-    # Remove honorific parentheticals
-    cleaned = HONORIFICS_PATTERN.sub("", raw)
-    # Remove reporting verbs at start/end
-    cleaned = VERB_PATTERN.sub("", cleaned)
-    # Strip punctuation artifacts
-    cleaned = cleaned.replace(":", "").replace("،", "")
+    return _extract_cached(raw)
+
+
+@lru_cache(maxsize=4096)
+def _extract_cached(raw: str) -> Optional[str]:
+    cleaned = STRIP_PATTERN.sub("", raw)
     cleaned = WHITESPACE_PATTERN.sub(" ", cleaned)
     return cleaned.strip(" -\u200f\u200e\ufeff") or None
 
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from .normalization import extract_narrator_name
 
@@ -16,9 +17,18 @@ class QueryType:
     MIXED = "mixed"
 
 
-NARRATED_PAT = re.compile(r"\b(narrated by|reported by|said by)\b\s*(.+)$", re.IGNORECASE)
-AR_NARRATOR_PAT = re.compile(r"\bعن\s+(.+)$")
+# English and Arabic narrator cues fused into one alternation so a single
+# scan finds either; the reference pattern stays separate because a query
+# can carry both a narrator and a book/number reference.
+NARRATOR_PAT = re.compile(
+    r"\b(?:narrated by|reported by|said by)\b\s*(?P<narr_en>.+)$"
+    r"|\bعن\s+(?P<narr_ar>.+)$",
+    re.IGNORECASE,
+)
 EXACT_REF_PAT = re.compile(r"\b(?:book|kitab|bk)?\s*\d+(?:\s*[:\-/]\s*\d+)?\b", re.IGNORECASE)
+QUOTED_DOUBLE_PAT = re.compile(r'"([^"]{3,})"')
+QUOTED_SINGLE_PAT = re.compile(r"'([^']{3,})'")
+TOKEN_PAT = re.compile(r"[\w؀-ۿ]+")
 
 
 def _strip_quotes(q: str) -> str:
@@ -29,18 +39,17 @@ def _strip_quotes(q: str) -> str:
 
 
 def _first_quoted_phrase(q: str) -> Optional[str]:
-    m = re.search(r'"([^"]{3,})"', q)
+    m = QUOTED_DOUBLE_PAT.search(q)
     if m:
         return m.group(1)
-    m = re.search(r"'([^']{3,})'", q)
+    m = QUOTED_SINGLE_PAT.search(q)
     if m:
         return m.group(1)
     return None
 
 
 def _tokenize(q: str) -> List[str]:
-    q = q.lower()
-    tokens = re.findall(r"[\w\u0600-\u06FF]+", q)
+    tokens = TOKEN_PAT.findall(q.lower())
     return [t for t in tokens if len(t) > 1]
 
 
@@ -51,59 +60,85 @@ class QueryIntent:
     normalized: str
     narrator_query: Optional[str] = None
     phrase: Optional[str] = None
-    tokens: List[str] = None  # type: ignore[assignment]
+    phrase_lower: Optional[str] = None
+    tokens: Tuple[str, ...] = ()
 
 
 def route_query(query: str) -> QueryIntent:
+    """Classify a query, serving repeats from an LRU cache.
+
+    REPL and HTTP callers re-issue identical queries; the cache skips the
+    regex scans and tokenization on those. Tokens are a tuple so the intent
+    stays safely shareable between callers.
+    """
+    return _route_query_cached(query)
+
+
+@lru_cache(maxsize=1024)
+def _route_query_cached(query: str) -> QueryIntent:
     q = query.strip()
     phrase = _first_quoted_phrase(q)
+    normalized = _strip_quotes(q)
+    # One regex scan covers both the thematic threshold and the intent's
+    # token tuple.
+    toks = tuple(_tokenize(normalized))
     narr = None
 
-    m = NARRATED_PAT.search(q)
+    m = NARRATOR_PAT.search(q)
     if m:
-        narr = extract_narrator_name(m.group(2)) or m.group(2).strip()
-
-    if narr is None:
-        m_ar = AR_NARRATOR_PAT.search(q)
-        if m_ar:
-            narr = extract_narrator_name(m_ar.group(1)) or m_ar.group(1).strip()
+        raw_narr = m.group("narr_en") or m.group("narr_ar")
+        narr = extract_narrator_name(raw_narr) or raw_narr.strip()
 
     if EXACT_REF_PAT.search(q):
         qtype = QueryType.EXACT_REFERENCE
     elif narr:
         qtype = QueryType.NARRATOR
     else:
-        toks = _tokenize(q)
         if len(toks) >= 4 or phrase:
             qtype = QueryType.THEMATIC
         else:
             qtype = QueryType.MIXED
 
-    normalized = _strip_quotes(q)
     return QueryIntent(
         type=qtype,
         raw=query,
         normalized=normalized,
         narrator_query=narr,
         phrase=phrase,
-        tokens=_tokenize(normalized),
+        phrase_lower=phrase.lower() if phrase else None,
+        tokens=toks,
     )
 
 
 def build_fts_match(intent: QueryIntent) -> str:
-    if intent.type == QueryType.NARRATOR and intent.narrator_query:
-        toks = _tokenize(intent.narrator_query)
-        if not toks:
-            toks = intent.tokens
+    return _build_fts_match_cached(
+        intent.type,
+        intent.narrator_query,
+        intent.phrase,
+        intent.tokens,
+        intent.normalized,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _build_fts_match_cached(
+    qtype: str,
+    narrator_query: Optional[str],
+    phrase: Optional[str],
+    tokens: Tuple[str, ...],
+    normalized: str,
+) -> str:
+    if qtype == QueryType.NARRATOR and narrator_query:
+        toks = _tokenize(narrator_query) or list(tokens)
         parts = [f"narrator:{t}*" for t in toks[:6]]
-        return " AND ".join(parts) if parts else intent.normalized
+        return " AND ".join(parts) if parts else normalized
 
-    if intent.phrase and len(intent.phrase) >= 3:
-        return f'"{intent.phrase}"'
+    if phrase and len(phrase) >= 3:
+        return f'"{phrase}"'
 
-    toks = intent.tokens[:6]
+    toks = list(tokens[:6])
     if not toks:
-        return intent.normalized
+        return normalized
     return " AND ".join(f"{t}*" for t in toks)
 
 
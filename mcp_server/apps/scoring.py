@@ -2,11 +2,47 @@
 
 from __future__ import annotations
 
+import heapq
+import re
 from dataclasses import dataclass
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 
+import numpy as np
+
+try:  # pragma: no cover - optional dependency check
+    import ahocorasick
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    ahocorasick = None  # type: ignore[assignment]
+
+from ._scoring_jit import combine_scores, near_scan
 from .router import QueryIntent, QueryType
 
+_TOKEN_RE = re.compile(r"[\w؀-ۿ]+")
+
+
+@dataclass(slots=True)
+class HitContext:
+    """Per-candidate text views computed once and shared across score terms."""
+
+    text: str
+    text_lower: str
+    tokens: tuple
+
+    @classmethod
+    def from_text(cls, text: str) -> "HitContext":
+        lower = text.lower()
+        return cls(text=text, text_lower=lower, tokens=tuple(_TOKEN_RE.findall(lower)))
+
+
+@dataclass(slots=True, frozen=True)
+class PreparedQuery:
+    """Query-side features computed once per search and shared per candidate."""
+
+    phrase_lower: Optional[str]
+    tokens: Tuple[str, ...]
+    groups: Tuple[frozenset, ...]
+
 
 @dataclass
 class ScoreBreakdown:
@@ -33,16 +69,42 @@ class HybridScorer:
         self.bonus_proximity = bonus_proximity
         self.weight_term_coverage = weight_term_coverage
 
-    def calculate_priority_score(
+    def prepare(
         self,
         intent: QueryIntent,
-        text: str,
+        synonym_groups: Optional[List[List[str]] | Tuple[frozenset, ...]] = None,
+    ) -> PreparedQuery:
+        """Bundle the query-side features so per-candidate calls reuse them."""
+        return PreparedQuery(
+            phrase_lower=intent.phrase_lower,
+            tokens=intent.tokens,
+            groups=prepare_synonym_groups(synonym_groups),
+        )
+
+    def calculate_priority_score(
+        self,
+        intent: QueryIntent | PreparedQuery,
+        text: str | HitContext,
         vector_similarity: Optional[float],
         fts_bm25: Optional[float],
         *,
-        synonym_groups: Optional[List[List[str]]] = None,
+        synonym_groups: Optional[List[List[str]] | Tuple[frozenset, ...]] = None,
         near_window: int = 5,
     ) -> ScoreBreakdown:
+        # A prebuilt HitContext shares the lowercased text and token tuple
+        # across the phrase/coverage/proximity terms; bare strings are
+        # wrapped on the fly.
+        ctx = text if isinstance(text, HitContext) else HitContext.from_text(text)
+        prepared = (
+            intent
+            if isinstance(intent, PreparedQuery)
+            else self.prepare(intent, synonym_groups)
+        )
+        # Hoist the weights into locals; this method runs once per candidate
+        # and LOAD_FAST beats repeated attribute lookups on self.
+        weight_vector = self.weight_vector
+        weight_fts = self.weight_fts
+        weight_term_coverage = self.weight_term_coverage
         v = max(0.0, min(1.0, vector_similarity or 0.0))
         # Convert bm25 (lower is better) into [0,1] signal
         fts_signal = 0.0
@@ -50,50 +112,31 @@ class HybridScorer:
             fts_signal = 1.0 / (1.0 + max(0.0, fts_bm25))
         fts_signal = max(0.0, min(1.0, fts_signal))
 
+        # phrase_lower is precomputed on the intent so neither side of the
+        # containment check allocates a lowercased copy here.
         phrase_bonus = 0.0
-        if intent.phrase and intent.phrase.lower() in text.lower():
+        if prepared.phrase_lower and prepared.phrase_lower in ctx.text_lower:
             phrase_bonus = self.bonus_phrase
 
         # Term coverage over synonym groups if provided; else fall back to tokens
         coverage = 0.0
-        t = text.lower()
-        if synonym_groups:
-            total_groups = len(synonym_groups)
-            if total_groups > 0:
-                hits = 0
-                for group in synonym_groups:
-                    if any(tok.lower() in t for tok in group):
-                        hits += 1
-                coverage = hits / float(total_groups)
-        elif intent.tokens:
-            hits = sum(1 for tok in intent.tokens if tok in t)
-            coverage = hits / float(len(intent.tokens))
+        t = ctx.text_lower
+        groups = prepared.groups
+        if groups:
+            hits = _covered_groups(ctx.tokens, ctx.text_lower, groups)
+            coverage = hits / float(len(groups))
+        elif prepared.tokens:
+            hits = sum(1 for tok in prepared.tokens if tok in t)
+            coverage = hits / float(len(prepared.tokens))
 
         # Proximity bonus: if at least two groups exist, check near-window proximity
         proximity_bonus = 0.0
-        if synonym_groups and len(synonym_groups) >= 2:
-            tokens = [w for w in _simple_tokenize(t)]
-            # Build indices for first two groups only (verb-group, family-group)
-            g0 = set(w.lower() for w in synonym_groups[0])
-            g1 = set(w.lower() for w in synonym_groups[1])
-            pos_g0 = [i for i, w in enumerate(tokens) if w in g0]
-            pos_g1 = [i for i, w in enumerate(tokens) if w in g1]
-            if pos_g0 and pos_g1:
-                # Check minimal distance
-                j = 0
-                found_near = False
-                for i in pos_g0:
-                    # advance j to keep pos_g1[j] close to i
-                    while j + 1 < len(pos_g1) and abs(pos_g1[j + 1] - i) <= abs(pos_g1[j] - i):
-                        j += 1
-                    if abs(pos_g1[j] - i) <= max(1, near_window):
-                        found_near = True
-                        break
-                if found_near:
-                    proximity_bonus = self.bonus_proximity
-
-        base = (self.weight_vector * v) + (self.weight_fts * fts_signal)
-        total = base + phrase_bonus + proximity_bonus + (self.weight_term_coverage * coverage)
+        if len(groups) >= 2:
+            if _has_near_pair(ctx.tokens, groups[0], groups[1], near_window):
+                proximity_bonus = self.bonus_proximity
+
+        base = (weight_vector * v) + (weight_fts * fts_signal)
+        total = base + phrase_bonus + proximity_bonus + (weight_term_coverage * coverage)
         total = max(0.0, min(1.0, total))
 
         return ScoreBreakdown(
@@ -105,6 +148,168 @@ class HybridScorer:
             total=total,
         )
 
+    def score_batch(
+        self,
+        intent: QueryIntent | PreparedQuery,
+        texts: List[str],
+        vector_similarities: List[Optional[float]],
+        fts_bm25s: List[Optional[float]],
+        *,
+        synonym_groups: Optional[List[List[str]] | Tuple[frozenset, ...]] = None,
+        near_window: int = 5,
+        top_k: Optional[int] = None,
+    ) -> List[ScoreBreakdown]:
+        """Score many candidates at once with the arithmetic vectorized.
+
+        Equivalent to calling calculate_priority_score per candidate, but the
+        clip/convert/combine math runs as NumPy array ops and each text is
+        lowercased exactly once. When ``top_k`` is given, candidates whose
+        best-case total (base signal plus every text bonus) cannot reach the
+        current top-k floor skip the text analysis entirely; their breakdown
+        carries the base signal only, which never changes which candidates
+        make the cut.
+        """
+        n = len(texts)
+        if n == 0:
+            return []
+
+        v = np.asarray(
+            [s if s is not None else 0.0 for s in vector_similarities],
+            dtype=np.float64,
+        )
+        v = np.clip(v, 0.0, 1.0)
+        b = np.asarray(
+            [x if x is not None else np.nan for x in fts_bm25s], dtype=np.float64
+        )
+        has_bm25 = ~np.isnan(b)
+        fts_signal = np.where(
+            has_bm25, 1.0 / (1.0 + np.maximum(np.nan_to_num(b), 0.0)), 0.0
+        )
+        fts_signal = np.clip(fts_signal, 0.0, 1.0)
+
+        prepared = (
+            intent
+            if isinstance(intent, PreparedQuery)
+            else self.prepare(intent, synonym_groups)
+        )
+        base = self.weight_vector * v + self.weight_fts * fts_signal
+        phrase = prepared.phrase_lower or ""
+        groups = prepared.groups
+
+        phrase_bonus = np.zeros(n)
+        coverage = np.zeros(n)
+        proximity_bonus = np.zeros(n)
+
+        max_bonus = (
+            (self.bonus_phrase if phrase else 0.0)
+            + (self.weight_term_coverage if (groups or prepared.tokens) else 0.0)
+            + (self.bonus_proximity if len(groups) >= 2 else 0.0)
+        )
+        if top_k is not None and 0 < top_k < n and max_bonus > 0.0:
+            self._score_texts_pruned(
+                prepared, texts, base, phrase, groups, near_window,
+                top_k, max_bonus, phrase_bonus, coverage, proximity_bonus,
+            )
+        else:
+            texts_lower = [t.lower() for t in texts]
+            if phrase:
+                phrase_bonus = np.fromiter(
+                    (self.bonus_phrase if phrase in t else 0.0 for t in texts_lower),
+                    dtype=np.float64,
+                    count=n,
+                )
+            if groups:
+                total_groups = float(len(groups))
+                check_proximity = len(groups) >= 2
+                for d, t in enumerate(texts_lower):
+                    tokens = _simple_tokenize(t)
+                    coverage[d] = _covered_groups(tokens, t, groups) / total_groups
+                    if check_proximity and _has_near_pair(
+                        tokens, groups[0], groups[1], near_window
+                    ):
+                        proximity_bonus[d] = self.bonus_proximity
+            elif prepared.tokens:
+                total_tokens = float(len(prepared.tokens))
+                for d, t in enumerate(texts_lower):
+                    coverage[d] = (
+                        sum(1 for tok in prepared.tokens if tok in t) / total_tokens
+                    )
+
+        total = combine_scores(
+            v,
+            fts_signal,
+            phrase_bonus,
+            proximity_bonus,
+            coverage,
+            self.weight_vector,
+            self.weight_fts,
+            self.weight_term_coverage,
+        )
+        return [
+            ScoreBreakdown(
+                vector_similarity=float(v[i]),
+                fts_signal=float(fts_signal[i]),
+                phrase_bonus=float(phrase_bonus[i]),
+                proximity_bonus=float(proximity_bonus[i]),
+                term_coverage=float(coverage[i]),
+                total=float(total[i]),
+            )
+            for i in range(n)
+        ]
+
+    def _score_texts_pruned(
+        self,
+        prepared: PreparedQuery,
+        texts: List[str],
+        base: np.ndarray,
+        phrase: str,
+        groups: Tuple[frozenset, ...],
+        near_window: int,
+        top_k: int,
+        max_bonus: float,
+        phrase_bonus: np.ndarray,
+        coverage: np.ndarray,
+        proximity_bonus: np.ndarray,
+    ) -> None:
+        """Fill the text-bonus arrays for candidates that can still reach top-k.
+
+        Candidates are visited in descending base order with a min-heap of
+        the best ``top_k`` totals seen so far; once a candidate's upper bound
+        (base plus every available bonus) falls below the heap floor, its
+        text is never lowercased or scanned.
+        """
+        check_proximity = len(groups) >= 2
+        total_groups = float(len(groups)) if groups else 0.0
+        total_tokens = float(len(prepared.tokens)) if prepared.tokens else 0.0
+        heap: List[float] = []
+        for d in np.argsort(-base):
+            if len(heap) == top_k and base[d] + max_bonus <= heap[0]:
+                continue
+            t = texts[d].lower()
+            if phrase and phrase in t:
+                phrase_bonus[d] = self.bonus_phrase
+            if groups:
+                tokens = _simple_tokenize(t)
+                coverage[d] = _covered_groups(tokens, t, groups) / total_groups
+                if check_proximity and _has_near_pair(
+                    tokens, groups[0], groups[1], near_window
+                ):
+                    proximity_bonus[d] = self.bonus_proximity
+            elif total_tokens:
+                coverage[d] = (
+                    sum(1 for tok in prepared.tokens if tok in t) / total_tokens
+                )
+            total_d = (
+                base[d]
+                + phrase_bonus[d]
+                + proximity_bonus[d]
+                + self.weight_term_coverage * coverage[d]
+            )
+            if len(heap) < top_k:
+                heapq.heappush(heap, total_d)
+            else:
+                heapq.heappushpop(heap, total_d)
+
 
 def serialize_breakdown(b: ScoreBreakdown) -> Dict[str, float]:
     return {
@@ -117,9 +322,97 @@ def serialize_breakdown(b: ScoreBreakdown) -> Dict[str, float]:
     }
 
 
-__all__ = ["HybridScorer", "ScoreBreakdown", "serialize_breakdown"]
+__all__ = [
+    "HitContext",
+    "HybridScorer",
+    "PreparedQuery",
+    "ScoreBreakdown",
+    "prepare_synonym_groups",
+    "serialize_breakdown",
+]
+
+
+def prepare_synonym_groups(
+    groups: Optional[List[List[str]]] | Tuple[frozenset, ...],
+) -> Tuple[frozenset, ...]:
+    """Normalize synonym groups to lowercased frozensets (cached per query).
+
+    Callers scoring many candidates should call this once and pass the
+    prepared tuple back in as ``synonym_groups``; already-prepared input is
+    returned as-is so the per-candidate path skips even the cache-key
+    lowercasing. Coverage then intersects the document's token set with
+    each group instead of scanning the raw text per token.
+    """
+    if not groups:
+        return ()
+    if isinstance(groups, tuple) and isinstance(groups[0], frozenset):
+        return groups
+    return _prepare_groups_cached(
+        tuple(tuple(tok.lower() for tok in group) for group in groups)
+    )
+
+
+@lru_cache(maxsize=256)
+def _prepare_groups_cached(groups: Tuple[Tuple[str, ...], ...]) -> Tuple[frozenset, ...]:
+    return tuple(frozenset(group) for group in groups)
+
+
+@lru_cache(maxsize=256)
+def _group_automaton(groups: Tuple[frozenset, ...]):
+    """Aho-Corasick automaton mapping every group token to its group index.
+
+    A single linear scan of the candidate text then yields every matched
+    group at once instead of one set intersection per group. Returns None
+    when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for gid, group in enumerate(groups):
+        for token in group:
+            automaton.add_word(token, (gid, len(token)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _covered_groups(tokens, text_lower: str, groups: Tuple[frozenset, ...]) -> int:
+    """Count how many synonym groups are represented in the candidate."""
+    automaton = _group_automaton(groups)
+    if automaton is None:
+        token_set = set(tokens)
+        return sum(1 for group in groups if token_set & group)
+    # Only whole-token hits count, matching the fallback's set
+    # intersection: a match flanked by word characters ("art" inside
+    # "heart") is discarded.
+    covered: set = set()
+    text_len = len(text_lower)
+    for end, (gid, length) in automaton.iter(text_lower):
+        if gid in covered:
+            continue
+        start = end - length + 1
+        if start > 0 and _TOKEN_RE.match(text_lower, start - 1):
+            continue
+        if end + 1 < text_len and _TOKEN_RE.match(text_lower, end + 1):
+            continue
+        covered.add(gid)
+    return len(covered)
 
 
 def _simple_tokenize(text: str) -> List[str]:
-    import re
-    return re.findall(r"[\w\u0600-\u06FF]+", text)
+    return _TOKEN_RE.findall(text)
+
+
+def _has_near_pair(tokens, g0: set, g1: set, near_window: int) -> bool:
+    """Return True when tokens from the two groups occur within the window."""
+    # Build indices for the two groups (verb-group, family-group)
+    pos_g0 = [i for i, w in enumerate(tokens) if w in g0]
+    pos_g1 = [i for i, w in enumerate(tokens) if w in g1]
+    if not pos_g0 or not pos_g1:
+        return False
+    return bool(
+        near_scan(
+            np.asarray(pos_g0, dtype=np.int32),
+            np.asarray(pos_g1, dtype=np.int32),
+            max(1, near_window),
+        )
+    )
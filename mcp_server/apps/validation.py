@@ -2,45 +2,47 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
-from .models import HadithDocument, BookStats
+try:  # pragma: no cover - optional dependency check
+    import polars as pl
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    pl = None  # type: ignore[assignment]
+
+from . import jsonio
+from .models import BookStats, HadithDocument, HadithRecord
+from .normalization import extract_narrator_name
+
+# Validating a whole book in one call keeps the loop inside pydantic-core
+# instead of paying per-record Python overhead.
+_BOOK_ADAPTER = TypeAdapter(List[HadithDocument])
 
 
 class ValidationIssue(Exception):
     """Raised when validation failures exceed acceptable thresholds."""
 
 
-def load_hadith_lines(path: Path) -> Iterable[str]:
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
+def load_hadith_lines(path: Path) -> Iterable[bytes]:
+    # One buffered read plus a byte-level split beats per-line text decoding;
+    # the raw UTF-8 lines feed jsonio (orjson when installed) directly.
+    data = path.read_bytes()
+    for line in data.split(b"\n"):
+        if line.strip():
             yield line
 
 
-def validate_book(path: Path, max_errors: int = 10) -> Tuple[List[HadithDocument], BookStats]:
-    records: List[HadithDocument] = []
+def validate_book(path: Path, max_errors: int = 10) -> Tuple[List[HadithRecord], BookStats]:
     warnings: List[str] = []
     errors = 0
-    narrators = set()
-    checksums = []
 
+    parsed: List[dict] = []
     for raw in load_hadith_lines(path):
         try:
-            data = json.loads(raw)
-            doc = HadithDocument.parse_obj(data)
-            records.append(doc)
-            if doc.canonical_narrator:
-                narrators.add(doc.canonical_narrator)
-            if doc.checksum:
-                checksums.append(doc.checksum)
-        except (json.JSONDecodeError, ValidationError) as exc:  # type: ignore[arg-type]
+            parsed.append(jsonio.loads(raw))
+        except ValueError as exc:
             errors += 1
             warnings.append(f"Validation error: {exc}")
             if errors >= max_errors:
@@ -48,6 +50,30 @@ def validate_book(path: Path, max_errors: int = 10) -> Tuple[List[HadithDocument
                     f"Validation halted after {errors} errors in {path}"
                 ) from exc
 
+    try:
+        records = _BOOK_ADAPTER.validate_python(parsed)
+    except ValidationError:
+        # The batch failed somewhere; re-validate per record so the bad
+        # entries become warnings with their own error text.
+        records = []
+        for data in parsed:
+            try:
+                records.append(HadithDocument.model_validate(data))
+            except ValidationError as exc:
+                errors += 1
+                warnings.append(f"Validation error: {exc}")
+                if errors >= max_errors:
+                    raise ValidationIssue(
+                        f"Validation halted after {errors} errors in {path}"
+                    ) from exc
+
+    # Downstream indexers only read a handful of fields; hand them slotted
+    # records and let the full pydantic objects go out of scope here.
+    light = [HadithRecord.from_document(doc) for doc in records]
+
+    narrators = {doc.canonical_narrator for doc in light if doc.canonical_narrator}
+    checksums = [doc.checksum for doc in light if doc.checksum]
+
     stats = BookStats(
         book_id=path.stem.replace("book_", ""),
         total_hadith=len(records),
@@ -55,7 +81,39 @@ def validate_book(path: Path, max_errors: int = 10) -> Tuple[List[HadithDocument
         checksum_examples=checksums[:5],
         warnings=warnings,
     )
-    return records, stats
+    return light, stats
+
+
+def book_stats_fast(path: Path) -> BookStats:
+    """Columnar stats for a book without full pydantic validation.
+
+    When polars is installed, only the narrator and checksum columns are
+    materialized and the unique-narrator count runs as a vectorized kernel;
+    otherwise this falls back to validate_book and discards the records.
+    """
+    if pl is None:
+        _, stats = validate_book(path)
+        return stats
+
+    df = pl.read_ndjson(path)
+    canonical = (
+        df.get_column("narrator")
+        .map_elements(extract_narrator_name, return_dtype=pl.Utf8)
+        if "narrator" in df.columns
+        else pl.Series("narrator", [], dtype=pl.Utf8)
+    )
+    checksums = (
+        df.get_column("checksum").drop_nulls().head(5).to_list()
+        if "checksum" in df.columns
+        else []
+    )
+    return BookStats(
+        book_id=path.stem.replace("book_", ""),
+        total_hadith=df.height,
+        unique_narrators=canonical.drop_nulls().n_unique(),
+        checksum_examples=checksums,
+        warnings=[],
+    )
 
 
-__all__ = ["validate_book", "ValidationIssue"]
+__all__ = ["validate_book", "book_stats_fast", "ValidationIssue"]
@@ -15,6 +15,7 @@ Add to ChatGPT MCP connections:
 from __future__ import annotations
 
 import asyncio
+import sys
 from pathlib import Path
 from typing import Any, Dict, Optional, Sequence
 
@@ -49,6 +50,7 @@ from .tools import hybrid_search as do_hybrid_search
 from .tools import fts_status as do_fts_status
 from .tools import vector_index_status as do_vector_status
 from .apps.fts import FTSIndex
+from .apps.fts_query import build_match
 
 
 server = Server("hadith-mcp")
@@ -101,10 +103,17 @@ _TOOL_DEFINITIONS: Sequence[Dict[str, Any]] = (
 )
 
 
-def _tool_models() -> Optional[Sequence[Any]]:
-    if Tool is None:
-        return None
-    return tuple(Tool(**definition) for definition in _TOOL_DEFINITIONS)
+# Built once at import: clients poll tools/list, and neither the dict
+# payload nor the SDK models change after startup. Callers must treat the
+# returned structures as read-only.
+_TOOL_MODELS: Optional[Sequence[Any]] = (
+    tuple(Tool(**definition) for definition in _TOOL_DEFINITIONS)
+    if Tool is not None
+    else None
+)
+_LIST_TOOLS_CACHED: Dict[str, Any] = {
+    "tools": [dict(tool) for tool in _TOOL_DEFINITIONS]
+}
 
 
 def _structured_result(data: Any | None = None, *, is_error: bool = False, text: Optional[str] = None) -> Any:
@@ -128,12 +137,16 @@ def _structured_result(data: Any | None = None, *, is_error: bool = False, text:
 
 
 def list_tools() -> Dict[str, Any]:
-    return {"tools": [dict(tool) for tool in _TOOL_DEFINITIONS]}
+    return _LIST_TOOLS_CACHED
 
 
 async def call_tool(name: str, args: Dict[str, Any]) -> Any:
+    # The tool bodies are synchronous SQLite/Chroma work; run them on a
+    # worker thread so the stdio framing loop keeps draining while a slow
+    # query is in flight. The FTS connections are per-thread already.
     if name == "hybrid_search":
-        data = do_hybrid_search(
+        data = await asyncio.to_thread(
+            do_hybrid_search,
             args.get("query"),
             n_results=int(args.get("n_results", 10)),
             mode=args.get("mode"),
@@ -146,46 +159,28 @@ async def call_tool(name: str, args: Dict[str, Any]) -> Any:
         return _structured_result(data)
 
     if name == "fts_status":
-        data = do_fts_status(collection=args.get("collection"))
+        data = await asyncio.to_thread(do_fts_status, collection=args.get("collection"))
         return _structured_result(data)
 
     if name == "vector_index_status":
-        data = do_vector_status(collection=args.get("collection"))
+        data = await asyncio.to_thread(do_vector_status, collection=args.get("collection"))
         return _structured_result(data)
 
     if name == "fts_match":
-        def _quote_if_needed(text: str) -> str:
-            t = text.strip()
-            if not t:
-                return t
-            if (t.startswith('"') and t.endswith('"')) or (t.startswith("'") and t.endswith("'")):
-                return t
-            if any(c.isspace() for c in t):
-                return f'"{t}"'
-            return t
-
-        def _build_match(en: Optional[str], ar: Optional[str], narrator: Optional[str]) -> Optional[str]:
-            parts = []
-            if en:
-                parts.append(f"english_text:{_quote_if_needed(en)}")
-            if ar:
-                parts.append(f"arabic_text:{_quote_if_needed(ar)}")
-            if narrator:
-                parts.append(f"narrator:{_quote_if_needed(narrator)}")
-            return " AND ".join(parts) if parts else None
-
-        col = (args.get("collection") or "riyadussalihin").lower()
+        col = sys.intern((args.get("collection") or "riyadussalihin").lower())
         db = (
             "data/indexes/fts/hadith.db"
             if col == "riyadussalihin"
             else f"data/indexes/{col}/fts.db"
         )
         idx = FTSIndex(db_path=Path(db))
-        expr = args.get("match") or _build_match(args.get("en"), args.get("ar"), args.get("narrator"))
+        expr = args.get("match") or build_match(args.get("en"), args.get("ar"), args.get("narrator"))
         if not expr:
             return _structured_result({"error": "Provide match or en/ar/narrator"}, is_error=True)
         try:
-            rows = idx.search_match(expr, limit=int(args.get("limit", 10)))
+            rows = await asyncio.to_thread(
+                idx.search_match, expr, limit=int(args.get("limit", 10))
+            )
         except Exception as exc:
             return _structured_result({"error": str(exc), "match": expr}, is_error=True)
         return _structured_result({"match": expr, "hits": rows})
@@ -204,12 +199,10 @@ def _refresh_tool_cache(models: Sequence[Any]) -> None:
 
 
 async def handle_list_tools_handler(request: Any | None = None, **_: Any) -> Any:
-    raw = list_tools()
-    if ListToolsResult is not None and ServerResult is not None and Tool is not None:
-        models = _tool_models() or ()
-        _refresh_tool_cache(models)
-        return ServerResult(ListToolsResult(tools=list(models)))
-    return raw
+    if ListToolsResult is not None and ServerResult is not None and _TOOL_MODELS is not None:
+        _refresh_tool_cache(_TOOL_MODELS)
+        return ServerResult(ListToolsResult(tools=list(_TOOL_MODELS)))
+    return list_tools()
 
 
 async def handle_call_tool_handler(
@@ -3,46 +3,92 @@
 from __future__ import annotations
 
 import json
-from functools import lru_cache
+import os
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+try:  # pragma: no cover - optional dependency check
+    import orjson
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    orjson = None  # type: ignore[assignment]
+
+from mcp_server.apps.encoder_registry import get_encoder as shared_encoder
+
 from .loader import QuranCorpus, TafsirEntry
 
 DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 _INDEX_DIR = Path("data/indexes/quran")
-_CACHE_FILENAME = "embeddings.npz"
+_VECTORS_FILENAME = "vectors.npy"
+_KEYS_FILENAME = "keys.json"
+_LEGACY_CACHE_FILENAME = "embeddings.npz"
 _METADATA_FILENAME = "metadata.json"
+# Bumped whenever the on-disk cache layout changes (vectors.npy + keys.json).
+_CACHE_VERSION = 2
 
 
-@lru_cache(maxsize=2)
-def get_encoder(model_name: str = DEFAULT_MODEL_NAME) -> SentenceTransformer:
-    """Return a cached sentence-transformers encoder."""
+def _loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    return SentenceTransformer(model_name)
 
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
 
-def _encode_texts(texts: Iterable[str], model_name: str) -> np.ndarray:
+
+def get_encoder(model_name: str = DEFAULT_MODEL_NAME) -> SentenceTransformer:
+    """Return the process-wide shared encoder for this model.
+
+    Both corpora default to the same MiniLM weights, so the shared
+    registry keeps a single copy loaded. QURAN_EMBED_PRECISION=fp16|bf16
+    still applies on CUDA; outputs stay float32 downstream either way.
+    """
+    precision = os.environ.get("QURAN_EMBED_PRECISION", "fp32").lower()
+    return shared_encoder(model_name, precision=precision)
+
+
+def _encode_texts(
+    texts: str | Iterable[str],
+    model_name: str,
+    batch_size: int = 64,
+) -> np.ndarray:
+    """Encode one query string (1D result) or an iterable of texts (2D).
+
+    The encoder already emits float32, so the dtype conversion only copies
+    when something actually needs converting.
+    """
     encoder = get_encoder(model_name)
     vectors = encoder.encode(
-        list(texts),
-        batch_size=64,
+        texts if isinstance(texts, str) else list(texts),
+        batch_size=batch_size,
         show_progress_bar=False,
         normalize_embeddings=True,
         convert_to_numpy=True,
     )
-    return vectors.astype(np.float32)
+    if vectors.dtype != np.float32:
+        vectors = vectors.astype(np.float32)
+    return vectors
 
 
 def _metadata_path(index_dir: Path) -> Path:
     return index_dir / _METADATA_FILENAME
 
 
-def _cache_path(index_dir: Path) -> Path:
-    return index_dir / _CACHE_FILENAME
+def _vectors_path(index_dir: Path) -> Path:
+    return index_dir / _VECTORS_FILENAME
+
+
+def _keys_path(index_dir: Path) -> Path:
+    return index_dir / _KEYS_FILENAME
+
+
+def _legacy_cache_path(index_dir: Path) -> Path:
+    return index_dir / _LEGACY_CACHE_FILENAME
 
 
 def _metadata_matches(existing: dict, model_name: str, corpus: QuranCorpus) -> bool:
@@ -68,28 +114,41 @@ def load_or_build_embeddings(
     index_dir = Path(index_dir)
     index_dir.mkdir(parents=True, exist_ok=True)
     meta_path = _metadata_path(index_dir)
-    cache_path = _cache_path(index_dir)
+    vectors_path = _vectors_path(index_dir)
+    keys_path = _keys_path(index_dir)
 
     metadata = {}
     if meta_path.exists():
         try:
-            metadata = json.loads(meta_path.read_text())
+            metadata = _loads(meta_path.read_bytes())
         except Exception:
             metadata = {}
 
-    if cache_path.exists() and _metadata_matches(metadata, model_name, corpus):
-        with np.load(cache_path, allow_pickle=True) as data:
-            vectors = data["vectors"]
-            keys = data["keys"].tolist()
-        return vectors.astype(np.float32), list(keys)
+    if _metadata_matches(metadata, model_name, corpus):
+        if vectors_path.exists() and keys_path.exists():
+            # Memory-map the read-only matrix: no decompression, no copy,
+            # and the OS shares the pages across server processes.
+            vectors = np.load(vectors_path, mmap_mode="r")
+            keys = _loads(keys_path.read_bytes())
+            return vectors, keys
+        legacy_path = _legacy_cache_path(index_dir)
+        if legacy_path.exists():
+            with np.load(legacy_path, allow_pickle=True) as data:
+                vectors = data["vectors"]
+                keys = data["keys"].tolist()
+            if vectors.dtype != np.float32:
+                vectors = vectors.astype(np.float32)
+            return vectors, list(keys)
 
     entries = corpus.entries
     texts = [entry.text_plain for entry in entries]
     keys = [entry.verse_key for entry in entries]
     vectors = _encode_texts(texts, model_name=model_name)
 
-    np.savez_compressed(cache_path, vectors=vectors, keys=np.array(keys))
+    np.save(vectors_path, np.ascontiguousarray(vectors, dtype=np.float32))
+    keys_path.write_bytes(_dumps(keys))
     new_metadata = {
+        "cache_version": _CACHE_VERSION,
         "model_name": model_name,
         "entry_count": len(entries),
         "manifest": corpus.manifest,
@@ -103,8 +162,8 @@ def encode_query(query: str, *, model_name: str = DEFAULT_MODEL_NAME) -> np.ndar
 
     if not query:
         raise ValueError("Query text must be non-empty for embedding")
-    vector = _encode_texts([query], model_name=model_name)[0]
-    return vector
+    # A bare string gives a 1D vector directly - no list wrapper or [0] slice.
+    return _encode_texts(query, model_name=model_name)
 
 
 __all__ = [
@@ -5,23 +5,50 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass
+
+import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from html import unescape
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+try:  # pragma: no cover - optional dependency check
+    import orjson
+except Exception:  # pragma: no cover - handle missing dependency gracefully
+    orjson = None  # type: ignore[assignment]
 
-_P_TAG_RE = re.compile(r"<[^>]+>")
+# Both orjson.JSONDecodeError and json.JSONDecodeError subclass ValueError.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Tags and whitespace runs both collapse to a single space, so one fused
+# alternation strips and normalizes in a single pass over the string.
+_TAG_OR_WS_RE = re.compile(r"(?:<[^>]+>|\s)+")
 _WHITESPACE_RE = re.compile(r"\s+")
 
+# On-disk cache of stripped text_html, so cold starts skip the regex and
+# unescape passes. One file per surah, stamped with the source (size, mtime).
+_PLAIN_CACHE_DIRNAME = ".plain_cache"
+_PLAIN_CACHE_VERSION = 1
+
+
+def _json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
 
 def _strip_html(value: str) -> str:
-    text = _P_TAG_RE.sub(" ", value)
-    text = unescape(text)
-    text = _WHITESPACE_RE.sub(" ", text)
-    return text.strip()
+    text = _TAG_OR_WS_RE.sub(" ", value)
+    unescaped = unescape(text)
+    if unescaped is not text:
+        # Entities can expand to whitespace (e.g. &nbsp;), so only strings
+        # that actually contained entities need the second collapse.
+        unescaped = _WHITESPACE_RE.sub(" ", unescaped)
+    return unescaped.strip()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TafsirEntry:
     """Represents a single tafsir record for a verse."""
 
@@ -36,6 +63,22 @@ class TafsirEntry:
     translated_name: Optional[Dict[str, str]] = None
 
 
+class CorpusRow(NamedTuple):
+    """The fields search result assembly reads, as one flat tuple.
+
+    The snippet and preview slices are cut once at load time so the merge
+    loop indexes prebuilt strings instead of re-slicing per hit.
+    """
+
+    verse_key: str
+    surah: int
+    ayah: int
+    resource_name: str
+    text_plain: str
+    snippet200: str
+    preview400: str
+
+
 class QuranCorpus:
     """Loads and caches tafsir entries from JSONL files."""
 
@@ -46,6 +89,11 @@ class QuranCorpus:
         self._entries: List[TafsirEntry] | None = None
         self._by_key: Dict[str, TafsirEntry] | None = None
         self._manifest: List[Dict[str, object]] | None = None
+        # Flat result rows + verse_key -> row index, so hot search paths
+        # resolve one int and unpack a prebuilt tuple instead of chasing
+        # dataclass attributes per hit.
+        self._index_of: Dict[str, int] | None = None
+        self._rows: List[CorpusRow] | None = None
 
     @property
     def entries(self) -> List[TafsirEntry]:
@@ -61,6 +109,90 @@ class QuranCorpus:
         assert self._by_key is not None
         return self._by_key
 
+    def _plain_cache_path(self, path: Path) -> Path:
+        return self.data_dir / _PLAIN_CACHE_DIRNAME / f"{path.stem}.v{_PLAIN_CACHE_VERSION}.json"
+
+    def _read_plain_cache(self, path: Path, size: int, mtime: float) -> Optional[Dict[str, str]]:
+        """Return the cached verse_key -> text_plain map, or None if stale."""
+        try:
+            payload = _json_loads(self._plain_cache_path(path).read_bytes())
+        except Exception:
+            return None
+        if payload.get("size") != size or payload.get("mtime") != mtime:
+            return None
+        plain = payload.get("plain")
+        return plain if isinstance(plain, dict) else None
+
+    def _write_plain_cache(self, path: Path, size: int, mtime: float, plain: Dict[str, str]) -> None:
+        """Best-effort write; a read-only data dir just means no cache."""
+        cache_path = self._plain_cache_path(path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(
+                _json_dumps({"size": size, "mtime": mtime, "plain": plain})
+            )
+        except OSError:
+            pass
+
+    def _load_file(
+        self, path: Path
+    ) -> tuple[Dict[str, object], List[TafsirEntry]]:
+        """Parse one surah file; safe to run concurrently per path."""
+        stat = path.stat()
+        file_size = stat.st_size
+        mtime = round(stat.st_mtime, 3)
+        manifest_item: Dict[str, object] = {
+            "name": path.name,
+            "size": file_size,
+            "mtime": mtime,
+        }
+        cached_plain = self._read_plain_cache(path, file_size, mtime)
+        stripped_plain: Dict[str, str] = {}
+        file_entries: List[TafsirEntry] = []
+        # One buffered read, then a newline scan with bytes.find: no
+        # per-line text decode and no up-front list of line slices.
+        data = path.read_bytes()
+        size = len(data)
+        start = 0
+        line_number = 0
+        while start < size:
+            nl = data.find(b"\n", start)
+            if nl == -1:
+                nl = size
+            line = data[start:nl]
+            start = nl + 1
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                payload = _json_loads(line)
+            except ValueError as exc:
+                raise ValueError(f"Invalid JSON at {path}:{line_number}: {exc}") from exc
+            verse_key = str(payload.get("verse_key"))
+            text_plain = payload.get("text_plain")
+            if not text_plain:
+                if cached_plain is not None:
+                    text_plain = cached_plain.get(verse_key)
+                if not text_plain:
+                    text_plain = _strip_html(str(payload.get("text_html", "")))
+                    stripped_plain[verse_key] = text_plain
+            file_entries.append(
+                TafsirEntry(
+                    surah=int(payload.get("surah")),
+                    ayah=int(payload.get("ayah")),
+                    verse_key=verse_key,
+                    resource_id=int(payload.get("resource_id", 0)),
+                    resource_name=str(payload.get("resource_name", "")),
+                    language_id=int(payload.get("language_id", 0)),
+                    slug=payload.get("slug"),
+                    text_plain=str(text_plain or ""),
+                    translated_name=payload.get("translated_name"),
+                )
+            )
+        if cached_plain is None and stripped_plain:
+            self._write_plain_cache(path, file_size, mtime, stripped_plain)
+        return manifest_item, file_entries
+
     def _load(self) -> None:
         entries: List[TafsirEntry] = []
         by_key: Dict[str, TafsirEntry] = {}
@@ -69,43 +201,47 @@ class QuranCorpus:
         if not jsonl_files:
             raise FileNotFoundError(f"No JSONL files found in {self.data_dir}")
 
-        for path in jsonl_files:
-            stat = path.stat()
-            manifest.append(
-                {
-                    "name": path.name,
-                    "size": stat.st_size,
-                    "mtime": round(stat.st_mtime, 3),
-                }
-            )
-            with path.open("r", encoding="utf-8") as handle:
-                for line_number, line in enumerate(handle, start=1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        payload = json.loads(line)
-                    except json.JSONDecodeError as exc:
-                        raise ValueError(f"Invalid JSON at {path}:{line_number}: {exc}") from exc
-                    text_plain = payload.get("text_plain")
-                    if not text_plain:
-                        text_plain = _strip_html(str(payload.get("text_html", "")))
-                    entry = TafsirEntry(
-                        surah=int(payload.get("surah")),
-                        ayah=int(payload.get("ayah")),
-                        verse_key=str(payload.get("verse_key")),
-                        resource_id=int(payload.get("resource_id", 0)),
-                        resource_name=str(payload.get("resource_name", "")),
-                        language_id=int(payload.get("language_id", 0)),
-                        slug=payload.get("slug"),
-                        text_plain=str(text_plain or ""),
-                        translated_name=payload.get("translated_name"),
-                    )
-                    entries.append(entry)
-                    by_key[entry.verse_key] = entry
+        # Parse surah files on a thread pool: the reads and the JSON parse
+        # (orjson's C code) release the GIL, and each file is independent.
+        # executor.map preserves input order, so the merged corpus is
+        # identical to a sequential load; the shared dicts and lists are
+        # built in this thread only.
+        workers = min(8, os.cpu_count() or 1, len(jsonl_files))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._load_file, jsonl_files))
+        for manifest_item, file_entries in results:
+            manifest.append(manifest_item)
+            for entry in file_entries:
+                entries.append(entry)
+                by_key[entry.verse_key] = entry
         self._entries = entries
         self._by_key = by_key
         self._manifest = manifest
+        self._rows = [
+            CorpusRow(
+                e.verse_key,
+                e.surah,
+                e.ayah,
+                e.resource_name,
+                e.text_plain,
+                e.text_plain[:200],
+                e.text_plain[:400],
+            )
+            for e in entries
+        ]
+        self._index_of = {e.verse_key: i for i, e in enumerate(entries)}
+
+    def index_of(self, verse_key: str) -> Optional[int]:
+        """Return the row index for a verse key, or None if unknown."""
+        if self._index_of is None:
+            self._load()
+        assert self._index_of is not None
+        return self._index_of.get(verse_key)
+
+    def row(self, index: int) -> CorpusRow:
+        """Return the flat result row at a previously resolved index."""
+        assert self._rows is not None
+        return self._rows[index]
 
     def iter_entries(self) -> Iterator[TafsirEntry]:
         yield from self.entries
@@ -132,4 +268,4 @@ def get_corpus(data_dir: Path | str = Path("data/quran")) -> QuranCorpus:
     return QuranCorpus(data_dir=data_dir)
 
 
-__all__ = ["TafsirEntry", "QuranCorpus", "get_corpus"]
+__all__ = ["CorpusRow", "TafsirEntry", "QuranCorpus", "get_corpus"]
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import re
 import sqlite3
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -18,6 +22,77 @@ from .embeddings import (
 )
 
 
+# Tokens fts5 treats as query syntax; left bare so boolean queries work.
+_FTS_OPERATORS = frozenset({"AND", "OR", "NOT", "NEAR"})
+
+# A balanced double-quoted segment is one phrase term; everything else
+# splits on whitespace.
+_MATCH_PART_RE = re.compile(r'"[^"]*"|\S+')
+
+
+@lru_cache(maxsize=4096)
+def _build_match(query: str) -> str:
+    """Return a MATCH-safe fts5 expression for raw user text.
+
+    Balanced double-quoted phrases pass through whole so fts5 keeps
+    their adjacency. Plain tokens, boolean operators and trailing-*
+    prefix tokens also pass untouched; anything with other punctuation
+    is quoted so it cannot be parsed as fts5 syntax. Cached because
+    autocomplete-style clients repeat the same query many times, and
+    each distinct MATCH string costs sqlite a query-parser pass.
+    """
+    parts = []
+    for token in _MATCH_PART_RE.findall(query):
+        if len(token) >= 2 and token[0] == '"' and token[-1] == '"':
+            parts.append(token)
+        elif token in _FTS_OPERATORS or token.isalnum():
+            parts.append(token)
+        elif token.endswith("*") and token[:-1].isalnum():
+            parts.append(token)
+        else:
+            parts.append('"' + token.replace('"', '""') + '"')
+    return " ".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _cached_encode_query(normalized: str, model_name: str) -> np.ndarray:
+    """Memoized query forward pass; repeated queries become a dict hit.
+
+    Callers must treat the returned array as read-only — it is shared
+    across every lookup of the same normalized query.
+    """
+    return encode_query(normalized, model_name=model_name)
+
+
+# Row-block size for the half-precision score kernel: 1024 rows of a
+# 384-D fp16 matrix is ~768 KB, small enough to upcast within L2.
+_HALF_BLOCK_ROWS = 1024
+
+
+def _half_matvec(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Matrix-vector product for an fp16 matrix, accumulated in fp32.
+
+    NumPy has no half-precision BLAS kernel, so a straight `matrix @ query`
+    on fp16 falls off the fast path. Upcasting one row block at a time
+    keeps the BLAS sgemv speed while the resident matrix stays half-size.
+    """
+    out = np.empty(matrix.shape[0], dtype=np.float32)
+    q = query.astype(np.float32, copy=False)
+    for start in range(0, matrix.shape[0], _HALF_BLOCK_ROWS):
+        block = matrix[start : start + _HALF_BLOCK_ROWS]
+        out[start : start + block.shape[0]] = block.astype(np.float32) @ q
+    return out
+
+
+# Hoisted so every query reuses one statement string; together with
+# cached_statements the parsed plan is reused instead of re-prepared.
+_FTS_SQL = (
+    "SELECT verse_key, surah, ayah, bm25(tafsir) AS rank, "
+    "snippet(tafsir, 3, '[', ']', ' … ', 32) AS snippet "
+    "FROM tafsir WHERE tafsir MATCH ? ORDER BY rank LIMIT ?"
+)
+
+
 @dataclass
 class SearchHit:
     verse_key: str
@@ -45,15 +120,57 @@ class QuranSearchIndex:
 
     def _ensure_connection(self) -> sqlite3.Connection:
         if self._conn is None:
-            conn = sqlite3.connect(":memory:")
+            conn = sqlite3.connect(":memory:", cached_statements=256)
             conn.execute("PRAGMA journal_mode=OFF")
-            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
             self._conn = conn
         return self._conn
 
+    def _fts_cache_path(self) -> Path:
+        """Cache file name keyed by the corpus manifest (sizes + mtimes)."""
+        stamp = hashlib.blake2b(
+            json.dumps(self.corpus.manifest, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        return self.corpus.data_dir / f".fts.{stamp}.sqlite"
+
+    def _open_fts_cache(self, cache_path: Path) -> bool:
+        """Open a previously persisted FTS database read-only, if present."""
+        if not cache_path.exists():
+            return False
+        try:
+            conn = sqlite3.connect(
+                f"file:{cache_path}?mode=ro&immutable=1",
+                uri=True,
+                cached_statements=256,
+            )
+            # Map the FTS segments instead of read() syscalls per query.
+            conn.execute("PRAGMA mmap_size=268435456")
+        except sqlite3.Error:
+            return False
+        self._conn = conn
+        return True
+
+    def _persist_fts_cache(self, conn: sqlite3.Connection, cache_path: Path) -> None:
+        """Best-effort copy of the built index to disk for the next boot."""
+        tmp_path = cache_path.with_suffix(".sqlite.tmp")
+        try:
+            for stale in self.corpus.data_dir.glob(".fts.*.sqlite"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+            with sqlite3.connect(tmp_path) as disk_conn:
+                conn.backup(disk_conn)
+            os.replace(tmp_path, cache_path)
+        except (OSError, sqlite3.Error):
+            tmp_path.unlink(missing_ok=True)
+
     def _ensure_index(self) -> None:
         if self._loaded:
             return
+        cache_path = self._fts_cache_path()
+        if self._conn is None and self._open_fts_cache(cache_path):
+            self._loaded = True
+            return
         conn = self._ensure_connection()
         conn.execute(
             "CREATE VIRTUAL TABLE IF NOT EXISTS tafsir USING fts5("
@@ -63,12 +180,18 @@ class QuranSearchIndex:
             "content"
             ")"
         )
+        conn.execute("PRAGMA cache_size=-65536")
+        # One executemany under one transaction: SQLite binds rows in a C
+        # loop instead of ~6k per-row execute() round trips.
         with conn:
-            for entry in self.corpus.iter_entries():
-                conn.execute(
-                    "INSERT INTO tafsir (verse_key, surah, ayah, content) VALUES (?, ?, ?, ?)",
-                    (entry.verse_key, entry.surah, entry.ayah, entry.text_plain),
-                )
+            conn.executemany(
+                "INSERT INTO tafsir (verse_key, surah, ayah, content) VALUES (?, ?, ?, ?)",
+                (
+                    (entry.verse_key, entry.surah, entry.ayah, entry.text_plain)
+                    for entry in self.corpus.iter_entries()
+                ),
+            )
+        self._persist_fts_cache(conn, cache_path)
         self._loaded = True
 
     def _ensure_vectors(self) -> None:
@@ -88,6 +211,10 @@ class QuranSearchIndex:
             self._vectors = None
             self._vector_keys = None
             return
+        # QURAN_VECTOR_DTYPE=fp16 halves the resident matrix; the vectors
+        # are normalized, so half precision costs ~1e-3 of similarity.
+        if os.environ.get("QURAN_VECTOR_DTYPE", "fp32").lower() in ("fp16", "float16"):
+            vectors = np.asarray(vectors, dtype=np.float16)
         self._vectors = vectors
         self._vector_keys = keys
 
@@ -99,7 +226,7 @@ class QuranSearchIndex:
         if self._vectors is not None:
             vector_count = int(self._vectors.shape[0])
         return {
-            "entries": int(row["n"] if row is not None else 0),
+            "entries": int(row[0]) if row else 0,
             "surah_count": len({e.surah for e in self.corpus.entries}),
             "loaded": self._loaded,
             "vector_model": self._model_name,
@@ -116,28 +243,20 @@ class QuranSearchIndex:
     def _fts_search(self, query: str, limit: int) -> Tuple[List[Dict[str, object]], Optional[str]]:
         conn = self._ensure_connection()
         try:
-            rows = conn.execute(
-                "SELECT verse_key, surah, ayah, bm25(tafsir) AS rank, "
-                "snippet(tafsir, 3, '[', ']', ' … ', 32) AS snippet "
-                "FROM tafsir WHERE tafsir MATCH ? ORDER BY rank LIMIT ?",
-                (query, int(limit)),
-            ).fetchall()
+            rows = conn.execute(_FTS_SQL, (_build_match(query), int(limit))).fetchall()
         except sqlite3.OperationalError as exc:
             return [], str(exc)
 
         hits: List[Dict[str, object]] = []
-        for row in rows:
-            verse_key = row["verse_key"]
-            entry = self.corpus.get_by_verse_key(verse_key)
-            if entry is None:
+        for verse_key, _surah, _ayah, rank, snippet in rows:
+            if self.corpus.index_of(verse_key) is None:
                 continue
-            rank = float(row["rank"])
-            score = 1.0 / (1.0 + max(rank, 0.0))
+            score = 1.0 / (1.0 + max(float(rank), 0.0))
             hits.append(
                 {
                     "verse_key": verse_key,
-                    "score": float(score),
-                    "snippet": row["snippet"],
+                    "score": score,
+                    "snippet": snippet,
                 }
             )
         return hits, None
@@ -151,17 +270,23 @@ class QuranSearchIndex:
         if self._vectors is None or self._vector_keys is None:
             return [], "Vector index unavailable"
         try:
-            query_vec = encode_query(query, model_name=self._model_name)
+            query_vec = _cached_encode_query(query.strip().lower(), self._model_name)
         except Exception as exc:  # pragma: no cover - defensive
             return [], str(exc)
 
-        scores = np.dot(self._vectors, query_vec)
-        if not np.isfinite(scores).all():
-            scores = np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0)
+        if self._vectors.dtype == np.float16:
+            scores = _half_matvec(self._vectors, query_vec)
+        else:
+            scores = np.dot(self._vectors, query_vec)
+        # The dot product owns this array, so sanitize in place; one pass
+        # instead of an isfinite scan followed by a conditional rewrite.
+        np.nan_to_num(scores, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
         top_k = min(limit, scores.shape[0])
         if top_k <= 0:
             return [], None
-        top_indices = np.argsort(scores)[-top_k:][::-1]
+        # Partition picks the top-k in linear time; only those k get sorted.
+        top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")]
         hits: List[Dict[str, object]] = []
         for idx in top_indices:
             sim = float(scores[idx])
@@ -214,88 +339,81 @@ class QuranSearchIndex:
                 if fts_weight == 0.0:
                     fts_weight = 1.0
 
-        combined: Dict[str, Dict[str, object]] = {}
+        # Merge both hit lists as sparse score vectors over the corpus rows:
+        # each hit writes one float at its int row index, the weighted sum
+        # and ordering run in NumPy, and response dicts are built only for
+        # the candidates that survive ranking and dedupe.
+        n_rows = len(self.corpus.entries)
+        fts_scores = np.zeros(n_rows, dtype=np.float32)
+        vec_scores = np.zeros(n_rows, dtype=np.float32)
+        seen = np.zeros(n_rows, dtype=bool)
+        fts_snippets: Dict[int, str] = {}
+
         for hit in fts_hits:
-            verse_key = hit["verse_key"]
-            entry = self.corpus.get_by_verse_key(verse_key)
-            if entry is None:
+            idx = self.corpus.index_of(hit["verse_key"])
+            if idx is None:
                 continue
-            combined[verse_key] = {
-                "verse_key": verse_key,
-                "surah": entry.surah,
-                "ayah": entry.ayah,
-                "resource": entry.resource_name,
-                "snippet": hit.get("snippet") or entry.text_plain[:200],
-                "text_preview": entry.text_plain[:400],
-                "fts_score": hit.get("score", 0.0),
-                "vector_score": 0.0,
-            }
+            seen[idx] = True
+            fts_scores[idx] = hit.get("score", 0.0)
+            snippet = hit.get("snippet")
+            if snippet:
+                fts_snippets[idx] = snippet
 
         for hit in semantic_hits:
-            verse_key = hit["verse_key"]
-            entry = self.corpus.get_by_verse_key(verse_key)
-            if entry is None:
+            idx = self.corpus.index_of(hit["verse_key"])
+            if idx is None:
                 continue
-            item = combined.get(verse_key)
-            if item is None:
-                item = {
-                    "verse_key": verse_key,
-                    "surah": entry.surah,
-                    "ayah": entry.ayah,
-                    "resource": entry.resource_name,
-                    "snippet": entry.text_plain[:200],
-                    "text_preview": entry.text_plain[:400],
-                    "fts_score": 0.0,
-                    "vector_score": 0.0,
-                }
-                combined[verse_key] = item
-            item["vector_score"] = max(item.get("vector_score", 0.0), hit.get("score", 0.0))
+            seen[idx] = True
+            score = hit.get("score", 0.0)
+            if score > vec_scores[idx]:
+                vec_scores[idx] = score
 
-        for item in combined.values():
-            total = vec_weight * item.get("vector_score", 0.0) + fts_weight * item.get("fts_score", 0.0)
-            item["score"] = round(float(total), 6)
-
-        sorted_items = sorted(
-            combined.values(), key=lambda x: x.get("score", 0.0), reverse=True
+        candidates = np.nonzero(seen)[0]
+        # Round everything once in NumPy; the emit loop only float()s the
+        # handful of winners.
+        vec_cand = np.round(vec_scores[candidates].astype(np.float64), 6)
+        fts_cand = np.round(fts_scores[candidates].astype(np.float64), 6)
+        totals = np.round(
+            vec_weight * vec_scores[candidates].astype(np.float64)
+            + fts_weight * fts_scores[candidates].astype(np.float64),
+            6,
         )
+        rank = np.argsort(-totals, kind="stable")
 
-        deduped_hits = []
+        out_hits: List[Dict[str, object]] = []
         duplicate_count = 0
-        if dedupe:
-            seen_blocks: set[str] = set()
-            for item in sorted_items:
-                block = (item.get("text_preview") or item.get("snippet") or "").strip()
-                if not block:
-                    block = item.get("verse_key", "")
+        seen_blocks: set[str] = set()
+        for j in rank:
+            idx = int(candidates[j])
+            row = self.corpus.row(idx)
+            if dedupe:
+                block = (row.preview400 or row.snippet200).strip() or row.verse_key
                 if block in seen_blocks:
                     duplicate_count += 1
                     continue
                 seen_blocks.add(block)
-                deduped_hits.append(item)
-                if len(deduped_hits) >= limit:
-                    break
-        else:
-            deduped_hits = sorted_items[: int(limit)]
+            out_hits.append(
+                {
+                    "verse_key": row.verse_key,
+                    "surah": row.surah,
+                    "ayah": row.ayah,
+                    "resource": row.resource_name,
+                    "snippet": fts_snippets.get(idx) or row.snippet200,
+                    "score": float(totals[j]),
+                    "scores": {
+                        "vector": float(vec_cand[j]),
+                        "fts": float(fts_cand[j]),
+                    },
+                }
+            )
+            if len(out_hits) >= limit:
+                break
 
         result = {
             "query": query,
             "mode": mode,
             "limit": limit,
-            "hits": [
-                {
-                    "verse_key": item["verse_key"],
-                    "surah": item["surah"],
-                    "ayah": item["ayah"],
-                    "resource": item["resource"],
-                    "snippet": item["snippet"],
-                    "score": item["score"],
-                    "scores": {
-                        "vector": round(float(item.get("vector_score", 0.0)), 6),
-                        "fts": round(float(item.get("fts_score", 0.0)), 6),
-                    },
-                }
-                for item in deduped_hits
-            ],
+            "hits": out_hits,
             "weights": {
                 "weight_vector": vec_weight,
                 "weight_fts": fts_weight,
@@ -311,7 +429,7 @@ class QuranSearchIndex:
             result["errors"] = errors
         if self._vector_error is not None:
             result["vector_error"] = self._vector_error
-        result["total_candidates"] = len(combined)
+        result["total_candidates"] = int(candidates.shape[0])
         if dedupe:
             result["duplicates_filtered"] = duplicate_count
             result["returned_hits"] = len(result["hits"])
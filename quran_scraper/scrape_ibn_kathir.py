@@ -3,21 +3,49 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
+import asyncio
+import atexit
+import os
+import random
 import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, NamedTuple, Optional
 
-import requests
-from requests import Response
-from selectolax.parser import HTMLParser
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
-API_TEMPLATE = "https://api.qurancdn.com/api/qdc/tafsirs/{slug}/by_ayah/{surah}:{ayah}"
-HTML_URL_TEMPLATE = "https://quran.com/{surah}:{ayah}/tafsirs/{slug}"
+API_BASE = "https://api.qurancdn.com/api/qdc/tafsirs"
+HTML_BASE = "https://quran.com"
 RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class SurahUrls(NamedTuple):
+    """Per-surah URL pieces; ayah URLs are built by concatenation."""
+
+    api_prefix: str
+    html_prefix: str
+    html_suffix: str
+
 MAX_CONSECUTIVE_404 = 2
-ARABIC_DIGIT_SUFFIX = re.compile(r"[\s\u0660-\u0669\u06F0-\u06F9\d]+$")
+# Trailing ayah-number characters: ASCII digits, Arabic-Indic and Extended
+# Arabic-Indic digits, and whitespace. str.rstrip over this precomputed set
+# replaces the regex suffix match with a C-level scan.
+_TRAILING_CHARS = (
+    "0123456789 \t\n\r\x0b\x0c"
+    + "".join(chr(c) for c in range(0x0660, 0x066A))
+    + "".join(chr(c) for c in range(0x06F0, 0x06FA))
+)
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+
+def _dumps_line(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Scrape Quran tafsir content")
@@ -25,7 +53,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--end-surah", type=int, default=114, help="Last surah to scrape")
     parser.add_argument("--start-ayah", type=int, default=1, help="First ayah when starting at start-surah")
     parser.add_argument("--slug", default="en-tafisr-ibn-kathir", help="Tafsir slug to request")
-    parser.add_argument("--rate", type=float, default=1.0, help="Delay between requests in seconds")
+    parser.add_argument("--rate", type=float, default=1.0, help="Minimum seconds between requests (global)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum in-flight requests")
     parser.add_argument("--max-retries", type=int, default=5, help="Retry attempts for transient errors")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint if available")
     parser.add_argument("--checkpoint", type=Path, default=None, help="Override checkpoint path")
@@ -39,60 +68,108 @@ def repo_root() -> Path:
 def load_checkpoint(path: Path) -> Optional[tuple[int, int]]:
     if not path.exists():
         return None
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = orjson.loads(path.read_bytes())
     return data.get("surah"), data.get("ayah")
 
 def save_checkpoint(path: Path, surah: int, ayah: int) -> None:
+    """Atomically replace the checkpoint so a crash never leaves it torn."""
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {"surah": surah, "ayah": ayah, "timestamp": time.time()}
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(orjson.dumps(payload))
+    os.replace(tmp_path, path)
+
+# Failure-log handles stay open for the life of the process; reopening per
+# failure costs an open/close syscall pair for every retry under a network
+# storm. atexit flushes and closes whatever was opened.
+_LOG_HANDLES: dict[Path, IO[bytes]] = {}
+
+
+def _close_log_handles() -> None:
+    for handle in _LOG_HANDLES.values():
+        try:
+            handle.close()
+        except OSError:
+            pass
+    _LOG_HANDLES.clear()
+
+
+atexit.register(_close_log_handles)
+
 
 def log_failure(path: Path, surah: int, ayah: int, status: str, detail: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    entry = {
+    handle = _LOG_HANDLES.get(path)
+    if handle is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open("ab", buffering=1 << 16)
+        _LOG_HANDLES[path] = handle
+    handle.write(_dumps_line({
         "surah": surah,
         "ayah": ayah,
         "status": status,
         "detail": detail,
         "timestamp": time.time(),
-    }
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    }))
 
 def extract_plain_text(html_text: str) -> str:
-    parser = HTMLParser(html_text or "")
-    text = parser.text(separator="\n")
-    return text.strip()
+    if not html_text:
+        return ""
+    # strip=True trims whitespace during the single tree walk; the outer
+    # strip only trims the boundary separators Lexbor leaves behind.
+    body = HTMLParser(html_text).body
+    return body.text(separator="\n", strip=True).strip() if body is not None else ""
 
 def ensure_dirs(*paths: Path) -> None:
     for path in paths:
         path.mkdir(parents=True, exist_ok=True)
 
-def make_session() -> requests.Session:
-    session = requests.Session()
-    session.headers.update(
-        {
+def make_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=64, limit=128),
+        timeout=aiohttp.ClientTimeout(total=20),
+        headers={
             "User-Agent": "QuranTafsirScraper/1.0 (Educational Purpose)",
             "Accept": "application/json, text/html;q=0.9",
-        }
+        },
     )
-    return session
 
 
 def clean_arabic_text(text: str) -> str:
     if not text:
         return ""
-    return ARABIC_DIGIT_SUFFIX.sub("", text).strip()
+    return text.rstrip(_TRAILING_CHARS).strip()
+
+
+# Key precedence for the Arabic text variants; extending either list is a
+# one-line change instead of another branch in a get-or-get chain.
+_SIMPLE_KEYS = (
+    "text_uthmani_simple",
+    "textUthmaniSimple",
+    "textSimple",
+    "text_clean",
+    "text_imlaei",
+)
+_UTHMANI_KEYS = ("text_uthmani", "textUthmani", "qpc_uthmani_hafs")
+
+
+def _first(meta: dict[str, Any], keys: tuple[str, ...]) -> str:
+    return next((meta[key] for key in keys if meta.get(key)), "")
 
 
 def derive_arabic_from_meta(meta: dict[str, Any]) -> dict[str, str]:
-    simple = (
-        meta.get("text_uthmani_simple")
-        or meta.get("textUthmaniSimple")
-        or meta.get("textSimple")
-        or meta.get("text_clean")
-    )
-    uthmani = meta.get("text_uthmani") or meta.get("textUthmani")
+    simple = _first(meta, _SIMPLE_KEYS)
+    uthmani = _first(meta, _UTHMANI_KEYS)
+    if not uthmani and not simple:
+        # Some payload variants only carry per-word text; joining them is
+        # still far cheaper than the ~200KB HTML fallback request.
+        words = meta.get("words")
+        if words:
+            joined = " ".join(
+                w.get("text_uthmani") or w.get("text") or ""
+                for w in words
+                if isinstance(w, dict)
+            ).strip()
+            uthmani = joined or None
     if not uthmani and simple:
         uthmani = simple
     if not simple and uthmani:
@@ -103,9 +180,18 @@ def derive_arabic_from_meta(meta: dict[str, Any]) -> dict[str, str]:
     }
 
 
+# Counts how often the Arabic text came from payload metadata versus the
+# HTML fallback fetch; printed at the end of a run to verify the hit rate.
+ARABIC_SOURCE_COUNTS = {"meta": 0, "html": 0}
+
+
+_SEO_SELECTOR = "div[class*='SeoTextForVerse_visuallyHidden__']"
+
+
 def extract_arabic_from_html(html: str) -> dict[str, str]:
-    parser = HTMLParser(html or "")
-    container = parser.css_first("div[class*='SeoTextForVerse_visuallyHidden__']")
+    if not html:
+        return {"text_arabic_simple": "", "text_arabic_uthmani": ""}
+    container = HTMLParser(html).css_first(_SEO_SELECTOR)
     if not container:
         return {"text_arabic_simple": "", "text_arabic_uthmani": ""}
     lines = [clean_arabic_text(node.text()) for node in container.css("div") if node.text()]
@@ -116,91 +202,108 @@ def extract_arabic_from_html(html: str) -> dict[str, str]:
         "text_arabic_uthmani": uthmani,
     }
 
-def fetch_ayah(
-    session: requests.Session,
-    slug: str,
+async def fetch_ayah(
+    session: aiohttp.ClientSession,
+    limiter: Optional[AsyncLimiter],
+    url: str,
     surah: int,
     ayah: int,
     retries: int,
     failure_log: Path,
 ) -> tuple[Optional[dict[str, Any]], str]:
-    url = API_TEMPLATE.format(slug=slug, surah=surah, ayah=ayah)
     for attempt in range(retries):
         try:
-            response: Response = session.get(url, timeout=20)
-        except requests.RequestException as exc:
-            delay = min(2 ** attempt, 120)
+            if limiter is not None:
+                await limiter.acquire()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None), "ok"
+                if response.status == 404:
+                    return None, "missing"
+                if response.status in RETRYABLE_STATUS:
+                    detail = None
+                else:
+                    detail = (await response.text())[:500]
+                status_code = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
             log_failure(failure_log, surah, ayah, "network-error", str(exc))
-            time.sleep(delay)
+            await asyncio.sleep(min(2 ** attempt * random.uniform(0.5, 1.5), 120))
             continue
-        if response.status_code == 200:
-            return response.json(), "ok"
-        if response.status_code == 404:
-            return None, "missing"
-        if response.status_code in RETRYABLE_STATUS:
-            delay = min(2 ** attempt, 120)
-            time.sleep(delay)
+        if detail is None:
+            await asyncio.sleep(min(2 ** attempt * random.uniform(0.5, 1.5), 120))
             continue
-        log_failure(
-            failure_log,
-            surah,
-            ayah,
-            f"status-{response.status_code}",
-            response.text[:500],
-        )
+        log_failure(failure_log, surah, ayah, f"status-{status_code}", detail)
         return None, "error"
     log_failure(failure_log, surah, ayah, "max-retries", url)
     return None, "error"
 
 
-def fetch_arabic_text(
-    session: requests.Session,
-    slug: str,
+async def fetch_arabic_text(
+    session: aiohttp.ClientSession,
+    limiter: Optional[AsyncLimiter],
+    url: str,
     surah: int,
     ayah: int,
     retries: int,
     failure_log: Path,
 ) -> dict[str, str]:
-    url = HTML_URL_TEMPLATE.format(slug=slug, surah=surah, ayah=ayah)
     headers = {"Accept": "text/html,application/xhtml+xml"}
+    empty = {"text_arabic_simple": "", "text_arabic_uthmani": ""}
     for attempt in range(retries):
         try:
-            response: Response = session.get(url, headers=headers, timeout=20)
-        except requests.RequestException as exc:
-            delay = min(2 ** attempt, 120)
+            if limiter is not None:
+                await limiter.acquire()
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    return extract_arabic_from_html(await response.text())
+                if response.status == 404:
+                    log_failure(failure_log, surah, ayah, "html-404", url)
+                    return dict(empty)
+                if response.status in RETRYABLE_STATUS:
+                    detail = None
+                else:
+                    detail = (await response.text())[:500]
+                status_code = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
             log_failure(failure_log, surah, ayah, "html-network-error", str(exc))
-            time.sleep(delay)
+            await asyncio.sleep(min(2 ** attempt * random.uniform(0.5, 1.5), 120))
             continue
-        if response.status_code == 200:
-            return extract_arabic_from_html(response.text)
-        if response.status_code == 404:
-            log_failure(failure_log, surah, ayah, "html-404", url)
-            return {"text_arabic_simple": "", "text_arabic_uthmani": ""}
-        if response.status_code in RETRYABLE_STATUS:
-            delay = min(2 ** attempt, 120)
-            time.sleep(delay)
+        if detail is None:
+            await asyncio.sleep(min(2 ** attempt * random.uniform(0.5, 1.5), 120))
             continue
-        log_failure(
-            failure_log,
-            surah,
-            ayah,
-            f"html-status-{response.status_code}",
-            response.text[:500],
-        )
-        return {"text_arabic_simple": "", "text_arabic_uthmani": ""}
+        log_failure(failure_log, surah, ayah, f"html-status-{status_code}", detail)
+        return dict(empty)
     log_failure(failure_log, surah, ayah, "html-max-retries", url)
-    return {"text_arabic_simple": "", "text_arabic_uthmani": ""}
+    return dict(empty)
 
-def write_raw_payload(raw_dir: Path, surah: int, ayah: int, payload: dict[str, Any]) -> None:
-    target_dir = raw_dir / f"{surah:03d}"
-    target_dir.mkdir(parents=True, exist_ok=True)
+def write_raw_payload(target_dir: Path, surah: int, ayah: int, payload: dict[str, Any]) -> None:
+    """Write one raw payload; the caller creates target_dir once per surah."""
     raw_path = target_dir / f"{surah:03d}_{ayah:03d}.json"
-    raw_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    raw_path.write_bytes(_dumps_pretty(payload))
 
-def write_normalized_record(out_dir: Path, surah: int, record: dict[str, Any]) -> None:
+def flush_normalized_records(out_dir: Path, surah: int, lines: list[bytes]) -> None:
+    """Append a batch of encoded records with one open and one writelines."""
     jsonl_path = out_dir / f"surah_{surah:03d}.jsonl"
-    with jsonl_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with jsonl_path.open("ab", buffering=1 << 20) as handle:
+        handle.writelines(lines)
+
+def scan_done(out_dir: Path) -> set[str]:
+    """Collect verse_keys already written to surah_*.jsonl files.
+
+    A lost or stale checkpoint otherwise forces a full re-fetch; one pass
+    over the saved records turns those into skips.
+    """
+    done: set[str] = set()
+    for path in out_dir.glob("surah_*.jsonl"):
+        with path.open("rb") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                key = orjson.loads(line).get("verse_key")
+                if key:
+                    done.add(key)
+    return done
+
 
 def build_record(surah: int, ayah: int, payload: dict[str, Any]) -> dict[str, Any]:
     tafsir = payload.get("tafsir", {})
@@ -226,7 +329,116 @@ def build_record(surah: int, ayah: int, payload: dict[str, Any]) -> dict[str, An
         "fetched_at": time.time(),
     }
 
-def scrape(args: argparse.Namespace) -> None:
+
+async def scrape_ayah(
+    session: aiohttp.ClientSession,
+    limiter: Optional[AsyncLimiter],
+    semaphore: asyncio.Semaphore,
+    args: argparse.Namespace,
+    urls: SurahUrls,
+    surah: int,
+    ayah: int,
+    failure_log: Path,
+    done_keys: set[str],
+) -> tuple[int, str, Optional[tuple[dict[str, Any], dict[str, Any]]]]:
+    """Fetch one ayah (and its Arabic fallback) under the concurrency cap."""
+    if f"{surah}:{ayah}" in done_keys:
+        return ayah, "skipped", None
+    async with semaphore:
+        payload, status = await fetch_ayah(
+            session, limiter, urls.api_prefix + str(ayah), surah, ayah,
+            args.max_retries, failure_log,
+        )
+        if status != "ok":
+            return ayah, status, None
+        record = build_record(surah, ayah, payload)
+        if record.get("text_arabic_uthmani"):
+            ARABIC_SOURCE_COUNTS["meta"] += 1
+        else:
+            ARABIC_SOURCE_COUNTS["html"] += 1
+            html_arabic = await fetch_arabic_text(
+                session, limiter, f"{urls.html_prefix}{ayah}{urls.html_suffix}",
+                surah, ayah, args.max_retries, failure_log,
+            )
+            if html_arabic:
+                record.update(html_arabic)
+        return ayah, "ok", (payload, record)
+
+
+async def scrape_surah(
+    session: aiohttp.ClientSession,
+    limiter: Optional[AsyncLimiter],
+    semaphore: asyncio.Semaphore,
+    args: argparse.Namespace,
+    surah: int,
+    start_ayah: int,
+    out_dir: Path,
+    raw_dir: Path,
+    checkpoint_path: Path,
+    failure_log: Path,
+    done_keys: set[str],
+) -> None:
+    """Scrape one surah in concurrent chunks, writing results in ayah order.
+
+    Ayah counts are unknown up front, so the surah is walked in chunks of
+    `--concurrency` ayahs; the chunk's results come back in submission
+    order, which preserves the consecutive-404 end-of-surah detection.
+    Writes and checkpoints all happen in this coroutine.
+    """
+    chunk_size = max(1, args.concurrency)
+    # Build the URL prefixes once per surah; the per-ayah URLs are then a
+    # plain concatenation instead of re-parsing a format template.
+    urls = SurahUrls(
+        api_prefix=f"{API_BASE}/{args.slug}/by_ayah/{surah}:",
+        html_prefix=f"{HTML_BASE}/{surah}:",
+        html_suffix=f"/tafsirs/{args.slug}",
+    )
+    raw_surah_dir = raw_dir / f"{surah:03d}"
+    raw_surah_dir.mkdir(parents=True, exist_ok=True)
+    ayah = start_ayah
+    misses = 0
+    while True:
+        tasks = [
+            scrape_ayah(
+                session, limiter, semaphore, args, urls, surah, a, failure_log, done_keys
+            )
+            for a in range(ayah, ayah + chunk_size)
+        ]
+        results = await asyncio.gather(*tasks)
+        # Buffer the chunk's records and append them with one write; the
+        # checkpoint is only advanced after the batch is on disk.
+        lines: list[bytes] = []
+        last_ok: Optional[int] = None
+        done = False
+        for a, status, data in results:
+            if status == "missing":
+                misses += 1
+                if misses >= MAX_CONSECUTIVE_404:
+                    last = max(a - MAX_CONSECUTIVE_404, 0)
+                    print(f"surah {surah:03d}: completed at ayah {last}")
+                    done = True
+                    break
+                continue
+            misses = 0
+            if status == "skipped":
+                last_ok = a
+                continue
+            if status == "error":
+                continue
+            payload, record = data
+            write_raw_payload(raw_surah_dir, surah, a, payload)
+            lines.append(_dumps_line(record))
+            last_ok = a
+            print(f"saved {record['verse_key']}")
+        if lines:
+            flush_normalized_records(out_dir, surah, lines)
+            save_checkpoint(checkpoint_path, surah, last_ok + 1)
+        if done:
+            return
+        ayah += chunk_size
+
+
+async def scrape_async(args: argparse.Namespace) -> None:
     root = repo_root()
     out_dir = args.out_dir if args.out_dir else root / "data" / "quran"
     raw_dir = args.raw_dir if args.raw_dir else root / "html" / "quran"
@@ -235,7 +447,6 @@ def scrape(args: argparse.Namespace) -> None:
     )
     failure_log = root / "logs" / "quran" / "failed_requests.log"
     ensure_dirs(out_dir, raw_dir, checkpoint_path.parent, failure_log.parent)
-    session = make_session()
 
     start_surah = max(1, args.start_surah)
     end_surah = min(114, args.end_surah)
@@ -244,47 +455,50 @@ def scrape(args: argparse.Namespace) -> None:
     if start_surah > end_surah:
         raise ValueError("start-surah cannot exceed end-surah")
 
+    done_keys: set[str] = set()
     if args.resume:
         checkpoint = load_checkpoint(checkpoint_path)
         if checkpoint:
             start_surah, start_ayah = checkpoint
-
-    for surah in range(start_surah, end_surah + 1):
-        misses = 0
-        ayah = start_ayah if surah == start_surah else 1
-        while True:
-            payload, status = fetch_ayah(
-                session, args.slug, surah, ayah, args.max_retries, failure_log
+        done_keys = scan_done(out_dir)
+        if done_keys:
+            print(f"resume: {len(done_keys)} ayahs already on disk will be skipped")
+
+    # --rate keeps its meaning as the API's tolerated pacing: one request
+    # per `rate` seconds globally, but requests now overlap up to
+    # --concurrency deep instead of blocking the loop between them.
+    limiter = AsyncLimiter(1, args.rate) if args.rate > 0 else None
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async with make_session() as session:
+        for surah in range(start_surah, end_surah + 1):
+            first_ayah = start_ayah if surah == start_surah else 1
+            await scrape_surah(
+                session,
+                limiter,
+                semaphore,
+                args,
+                surah,
+                first_ayah,
+                out_dir,
+                raw_dir,
+                checkpoint_path,
+                failure_log,
+                done_keys,
             )
-            if status == "missing":
-                misses += 1
-                if misses >= MAX_CONSECUTIVE_404:
-                    print(f"surah {surah:03d}: completed at ayah {ayah - 1 if ayah > 1 else 0}")
-                    break
-                time.sleep(args.rate)
-                continue
-            if status == "error":
-                misses = 0
-                ayah += 1
-                time.sleep(args.rate)
-                continue
-            misses = 0
-            record = build_record(surah, ayah, payload)
-            if not record.get("text_arabic_uthmani"):
-                html_arabic = fetch_arabic_text(
-                    session, args.slug, surah, ayah, args.max_retries, failure_log
-                )
-                if html_arabic:
-                    record.update(html_arabic)
-            write_raw_payload(raw_dir, surah, ayah, payload)
-            write_normalized_record(out_dir, surah, record)
-            save_checkpoint(checkpoint_path, surah, ayah + 1)
-            print(f"saved {record['verse_key']}")
-            ayah += 1
-            time.sleep(args.rate)
-        start_ayah = 1
-        if surah < end_surah:
-            save_checkpoint(checkpoint_path, surah + 1, 1)
+            if surah < end_surah:
+                save_checkpoint(checkpoint_path, surah + 1, 1)
+
+    total = ARABIC_SOURCE_COUNTS["meta"] + ARABIC_SOURCE_COUNTS["html"]
+    if total:
+        print(
+            f"arabic text from metadata: {ARABIC_SOURCE_COUNTS['meta']}/{total} "
+            f"({ARABIC_SOURCE_COUNTS['html']} HTML fallback fetches)"
+        )
+
+
+def scrape(args: argparse.Namespace) -> None:
+    asyncio.run(scrape_async(args))
 
 
 def main() -> None:
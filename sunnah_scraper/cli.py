@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Sequence
 
@@ -22,10 +26,151 @@ DATA_ROOT = Path("data") / COLLECTION_SLUG
 HTML_ROOT = Path("html") / COLLECTION_SLUG
 
 
+FETCH_CONCURRENCY = 8
+_QUEUE_DEPTH = 8
+
+
+async def _scrape_books(
+    client: HttpClient,
+    index_entries: Sequence[BookIndexEntry],
+    collection_name: str,
+    parse_executor: ProcessPoolExecutor,
+) -> list[BookIndexEntry]:
+    """Fetch, parse and write books as a three-stage bounded pipeline.
+
+    Fetchers overlap network latency up to FETCH_CONCURRENCY deep while one
+    parse worker per core and one writer drain their queues, so wall-clock
+    tracks the slowest stage instead of the sum. The blocking HttpClient and
+    file writes run on worker threads; the CPU-bound selectolax parse goes
+    to a process pool fed by the worker pool, so parses actually run
+    concurrently across cores instead of serializing on the GIL. The
+    bounded queues cap how many book pages sit in memory at once.
+    """
+    fetch_sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    parse_q: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_DEPTH)
+    write_q: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_DEPTH)
+    # Raw parsed fields per book; BookIndexEntry construction (and its
+    # validation) happens once at the end instead of per book in the loop.
+    updates: dict[str, dict] = {}
+
+    async def fetch_book(entry: BookIndexEntry) -> None:
+        LOGGER.info("Processing book %s", entry.book_id)
+        async with fetch_sem:
+            book_html = await asyncio.to_thread(client.fetch_bytes, entry.source_url)
+        await parse_q.put((entry, book_html))
+
+    async def parse_worker() -> None:
+        while True:
+            item = await parse_q.get()
+            if item is None:
+                return
+            entry, book_html = item
+            snapshot_path = HTML_ROOT / f"{entry.book_id}.html"
+            await asyncio.to_thread(storage.write_html_snapshot, book_html, snapshot_path)
+            # Page bytes and keyword strings pickle cheaply; the parsed
+            # records come back as plain pydantic models.
+            parsed = await asyncio.get_running_loop().run_in_executor(
+                parse_executor,
+                functools.partial(
+                    parser.parse_book_page,
+                    book_html,
+                    collection_slug=COLLECTION_SLUG,
+                    collection_name=collection_name,
+                    book_id=entry.book_id,
+                    book_url=entry.source_url,
+                    fallback_book_title_en=entry.book_title_en,
+                ),
+            )
+            await write_q.put((entry, parsed))
+
+    async def writer() -> None:
+        while True:
+            item = await write_q.get()
+            if item is None:
+                return
+            entry, parsed = item
+            (
+                parsed_book_title_en,
+                parsed_book_title_ar,
+                parsed_book_number,
+                hadith_records,
+            ) = parsed
+            book_path = DATA_ROOT / f"book_{entry.book_id}.jsonl"
+            written = await asyncio.to_thread(
+                storage.write_book_records, hadith_records, book_path
+            )
+            LOGGER.info("Wrote %d hadith records for book %s", written, entry.book_id)
+            updates[entry.book_id] = {
+                "book_number": parsed_book_number,
+                "book_title_en": parsed_book_title_en,
+                "book_title_ar": parsed_book_title_ar,
+                "hadith_count": written,
+            }
+
+    fetch_task = asyncio.ensure_future(
+        asyncio.gather(*(fetch_book(entry) for entry in index_entries))
+    )
+    # One consumer per pool process keeps that many parses in flight; a
+    # single worker would await each future and leave the pool idle.
+    parse_tasks = [
+        asyncio.create_task(parse_worker()) for _ in range(os.cpu_count() or 1)
+    ]
+    write_task = asyncio.create_task(writer())
+    workers = [*parse_tasks, write_task]
+    tasks = {fetch_task, *workers}
+
+    async def _race_workers(awaitable):
+        """Run one shutdown step, letting a worker failure win the race.
+
+        A sentinel put (or a drain of the parse workers) can block on a
+        full queue whose consumer has died; racing each step against the
+        worker tasks surfaces that exception instead of hanging.
+        """
+        step = asyncio.ensure_future(awaitable)
+        while not step.done():
+            failed = next(
+                (t for t in workers if t is not step and t.done() and t.exception()),
+                None,
+            )
+            if failed is not None:
+                step.cancel()
+                await asyncio.gather(step, return_exceptions=True)
+                failed.result()
+            alive = {t for t in workers if not t.done()}
+            await asyncio.wait({step, *alive}, return_when=asyncio.FIRST_COMPLETED)
+        return step.result()
+
+    try:
+        # Fail fast: a dead worker would otherwise leave fetchers blocked
+        # forever on a full queue. Whichever task finishes first is either
+        # the fetch gather (normal) or a worker that raised; surfacing the
+        # exception here cancels the rest of the pipeline.
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+        for _ in parse_tasks:
+            await _race_workers(parse_q.put(None))
+        await _race_workers(asyncio.gather(*parse_tasks))
+        await _race_workers(write_q.put(None))
+        await write_task
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    # Emit the index in the collection's original book order regardless of
+    # pipeline completion order.
+    return [
+        entry.model_copy(update=updates[entry.book_id])
+        for entry in index_entries
+        if entry.book_id in updates
+    ]
+
+
 def run_collection_scrape(book_filter: Sequence[str] | None = None) -> None:
     LOGGER.info("Fetching collection index from %s", COLLECTION_URL)
     with HttpClient() as client:
-        collection_html = client.fetch_text(COLLECTION_URL)
+        collection_html = client.fetch_bytes(COLLECTION_URL)
         collection_name, index_entries = parser.parse_collection_index(
             collection_html,
             COLLECTION_SLUG,
@@ -34,35 +179,9 @@ def run_collection_scrape(book_filter: Sequence[str] | None = None) -> None:
         resolved_collection_name = collection_name or COLLECTION_SLUG.replace("-", " ").title()
         if book_filter:
             index_entries = [entry for entry in index_entries if entry.book_id in book_filter]
-        updated_entries: list[BookIndexEntry] = []
-        for entry in index_entries:
-            LOGGER.info("Processing book %s", entry.book_id)
-            book_html = client.fetch_text(entry.source_url)
-            snapshot_path = HTML_ROOT / f"{entry.book_id}.html"
-            storage.write_html_snapshot(book_html, snapshot_path)
-            (
-                parsed_book_title_en,
-                parsed_book_title_ar,
-                parsed_book_number,
-                hadith_records,
-            ) = parser.parse_book_page(
-                book_html,
-                collection_slug=COLLECTION_SLUG,
-                collection_name=resolved_collection_name,
-                book_id=entry.book_id,
-                book_url=entry.source_url,
-                fallback_book_title_en=entry.book_title_en,
-            )
-            book_path = DATA_ROOT / f"book_{entry.book_id}.jsonl"
-            written = storage.write_book_records(hadith_records, book_path)
-            LOGGER.info("Wrote %d hadith records for book %s", written, entry.book_id)
-            updated_entries.append(
-                entry.model_copy(update={
-                    "book_number": parsed_book_number,
-                    "book_title_en": parsed_book_title_en,
-                    "book_title_ar": parsed_book_title_ar,
-                    "hadith_count": written,
-                })
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as parse_executor:
+            updated_entries = asyncio.run(
+                _scrape_books(client, index_entries, resolved_collection_name, parse_executor)
             )
         storage.write_book_index(updated_entries, DATA_ROOT / "index.json")
 
@@ -8,7 +8,7 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-import requests
+import httpx
 from tenacity import before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 
@@ -38,18 +38,25 @@ class HttpClient:
     """Minimal HTTP client tailored for Sunnah.com scraping."""
 
     def __init__(self, rate_limiter: RateLimiter | None = None) -> None:
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": "RiyadScraper/0.1 (+https://example.com/contact)",
-            "Accept": "text/html,application/xhtml+xml",
-        })
+        # HTTP/2 multiplexes the many small page fetches over one pooled
+        # TLS connection instead of a handshake per request.
+        self._session = httpx.Client(
+            http2=True,
+            headers={
+                "User-Agent": "RiyadScraper/0.1 (+https://example.com/contact)",
+                "Accept": "text/html,application/xhtml+xml",
+            },
+            timeout=httpx.Timeout(20.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            follow_redirects=True,
+        )
         self._rate_limiter = rate_limiter or RateLimiter()
 
     @retry(
         reraise=True,
         stop=stop_after_attempt(5),
         wait=wait_random_exponential(multiplier=0.5, max=10),
-        retry=retry_if_exception_type((requests.RequestException, HttpError)),
+        retry=retry_if_exception_type((httpx.HTTPError, HttpError)),
         before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
     )
     def fetch_text(self, url: str, *, timeout: float = 20.0) -> str:
@@ -59,9 +66,25 @@ class HttpClient:
             raise HttpError(f"Server error {response.status_code} for {url}")
         if response.status_code >= 400:
             raise HttpError(f"Client error {response.status_code} for {url}")
-        response.encoding = response.apparent_encoding or response.encoding
         return response.text
 
+    @retry(
+        reraise=True,
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=0.5, max=10),
+        retry=retry_if_exception_type((httpx.HTTPError, HttpError)),
+        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+    )
+    def fetch_bytes(self, url: str, *, timeout: float = 20.0) -> bytes:
+        """Fetch the raw body; selectolax handles its own encoding sniff."""
+        self._rate_limiter.wait()
+        response = self._session.get(url, timeout=timeout)
+        if response.status_code >= 500:
+            raise HttpError(f"Server error {response.status_code} for {url}")
+        if response.status_code >= 400:
+            raise HttpError(f"Client error {response.status_code} for {url}")
+        return response.content
+
     def close(self) -> None:
         self._session.close()
 
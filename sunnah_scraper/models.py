@@ -8,6 +8,8 @@ from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, computed_field, model_validator
 
+_CHECKSUM_SEP = "␟".encode("utf-8")
+
 
 class HadithText(BaseModel):
     """Container for a hadith text in a specific language."""
@@ -72,13 +74,20 @@ class HadithRecord(BaseModel):
     @computed_field
     @property
     def checksum(self) -> str:
-        payload = "\u241f".join([
-            self.collection_slug,
-            self.book_id,
-            self.hadith_id_site,
-            "\u241f".join(text.content for text in self.texts),
-        ])
-        return sha256(payload.encode("utf-8")).hexdigest()
+        # Stream the fields into the hasher instead of materializing one
+        # joined payload string; the digest is unchanged.
+        h = sha256()
+        h.update(self.collection_slug.encode("utf-8"))
+        h.update(_CHECKSUM_SEP)
+        h.update(self.book_id.encode("utf-8"))
+        h.update(_CHECKSUM_SEP)
+        h.update(self.hadith_id_site.encode("utf-8"))
+        h.update(_CHECKSUM_SEP)
+        for index, text in enumerate(self.texts):
+            if index:
+                h.update(_CHECKSUM_SEP)
+            h.update(text.content.encode("utf-8"))
+        return h.hexdigest()
 
 
 class BookIndexEntry(BaseModel):
@@ -3,18 +3,51 @@
 from __future__ import annotations
 
 import logging
+import re
+import sys
 from dataclasses import dataclass
 from typing import Optional
-from urllib.parse import urljoin
+from urllib.parse import urlsplit
 
-from selectolax.parser import HTMLParser, Node
+from selectolax.lexbor import LexborHTMLParser as HTMLParser, LexborNode as Node
+
+from pydantic import HttpUrl
 
 from .models import BookIndexEntry, GradingEntry, HadithRecord, HadithText, ReferenceEntry
 
 LOGGER = logging.getLogger(__name__)
 
-
-@dataclass
+# Matches anything " ".join(value.split()) would change: leading/trailing
+# spaces, doubled spaces, or any non-space whitespace (tabs, newlines and
+# Unicode spaces such as \xa0).
+_NEEDS_NORMALIZE_RE = re.compile(r"^ |  | $|[^\S ]")
+
+# Selector strings used in the per-hadith loops, hoisted so every parse call
+# shares the same constants. Fallback chains are tuples tried in order.
+_COLLECTION_TITLE_SEL = ".collection_info .colindextitle"
+_BOOK_INFO_SEL = ".book_info .book_page_colindextitle"
+_NAMED_ANCHOR_SEL = "a[name]"
+# Combined alternation selectors: one subtree walk returns the first
+# matching title node in document order instead of one walk per fallback.
+_EN_CHAPTER_TITLE_SEL = (
+    ".englishchapter, .english, .chapter-title-english, "
+    ".english_chapter_name, .chapter-title"
+)
+_AR_CHAPTER_TITLE_SEL = (
+    ".arabicchapter, .arabic, .chapter-title-arabic, "
+    ".arabic_chapter_name, span[dir='rtl']"
+)
+_GRADE_ROW_SEL = ".hadith_grade, .hadith_rating"
+_GRADE_PARTS_SEL = ".gradeby, .grade, .grader_comment, strong"
+_HADITH_NUM_SEL = ".hadith_number, .hadith_reference_sticky"
+# One compiled-engine query returns the book's anchors, chapter headers and
+# hadith containers in document order; the Python side only dispatches.
+_BOOK_STREAM_SEL = "a[name], div.chapter, div.actualHadithContainer"
+_REFERENCE_TABLE_SEL = "table.hadith_reference"
+_TOPIC_SEL = ".hadith_topics span"
+
+
+@dataclass(frozen=True, slots=True)
 class ChapterContext:
     identifier: Optional[str]
     number_en: Optional[str]
@@ -23,18 +56,37 @@ class ChapterContext:
     title_ar: Optional[str]
 
 
+def _by_class(node: Node, cls: str):
+    """Yield descendants carrying a single class token.
+
+    For one-token queries a direct traverse skips the selector engine's
+    setup cost on these small containers.
+    """
+    for descendant in node.traverse(include_text=False):
+        if cls in (descendant.attributes.get("class") or "").split():
+            yield descendant
+
+
 def text_content(node: Optional[Node]) -> Optional[str]:
     if node is None:
         return None
     text = node.text(separator=" ", strip=True)
     if not text:
         return None
-    return normalize_text(text)
+    # Inline the normalize_text fast path; most extractions are already
+    # clean, so this skips a call and an allocation per node.
+    if _NEEDS_NORMALIZE_RE.search(text) is None:
+        return text
+    return " ".join(text.split()) or None
 
 
 def normalize_text(value: Optional[str]) -> Optional[str]:
-    if value is None:
+    if not value:
         return None
+    # Already-normalized input (the common case for text(strip=True)
+    # output) returns as-is instead of allocating a split list and a copy.
+    if _NEEDS_NORMALIZE_RE.search(value) is None:
+        return value
     normalized = " ".join(value.split())
     if not normalized:
         return None
@@ -42,23 +94,27 @@ def normalize_text(value: Optional[str]) -> Optional[str]:
 
 
 def parse_collection_index(
-    html: str,
+    html: str | bytes,
     collection_slug: str,
     collection_url: str,
 ) -> tuple[Optional[str], list[BookIndexEntry]]:
     tree = HTMLParser(html)
-    collection_name = text_content(tree.css_first(".collection_info .colindextitle"))
+    collection_name = text_content(tree.css_first(_COLLECTION_TITLE_SEL))
     if collection_name:
         collection_name = normalize_text(collection_name)
-    anchors = tree.css("a")
+    # Attribute-prefix filter in the selector engine: nav/footer anchors
+    # never reach the Python loop.
+    anchors = tree.css(f'a[href^="/{collection_slug}/"]')
     entries: list[BookIndexEntry] = []
     seen: set[str] = set()
+    # Every matching href is an absolute path, so joining is plain origin
+    # concatenation; urljoin would re-parse both URLs per anchor.
+    split = urlsplit(collection_url)
+    origin = f"{split.scheme}://{split.netloc}"
     for anchor in anchors:
         href = anchor.attributes.get("href")
         if not href:
             continue
-        if not href.startswith(f"/{collection_slug}/"):
-            continue
         parts = href.strip("/").split("/")
         if len(parts) != 2:
             continue
@@ -69,7 +125,7 @@ def parse_collection_index(
         if not title_en:
             continue
         title_en = normalize_text(title_en)
-        url = urljoin(collection_url, href)
+        url = origin + href
         entries.append(
             BookIndexEntry(
                 book_id=book_id,
@@ -87,54 +143,31 @@ def parse_collection_index(
 
 
 def parse_chapter_node(node: Node, *, fallback_anchor: Optional[str] = None) -> ChapterContext:
+    # The caller's document-order walk already tracks the nearest preceding
+    # named anchor as fallback_anchor, so no prev-sibling scan is needed.
     identifier = fallback_anchor
-    anchor = node.css_first("a[name]")
+    anchor = node.css_first(_NAMED_ANCHOR_SEL)
     if anchor is not None:
         identifier = anchor.attributes.get("name") or identifier
-    if identifier is None:
-        previous = node.prev
-        while previous is not None:
-            if previous.tag == "a" and "name" in previous.attributes:
-                identifier = previous.attributes.get("name")
-                break
-            previous = previous.prev
 
     number_en = text_content(node.css_first(".echapno"))
     number_ar = text_content(node.css_first(".achapno"))
 
-    title_en = text_content(node.css_first(".englishchapter"))
+    title_en = text_content(node.css_first(_EN_CHAPTER_TITLE_SEL))
     if title_en and title_en.lower().startswith("chapter:"):
         title_en = title_en.split(":", 1)[1].strip() or title_en
         title_en = normalize_text(title_en)
-    if not title_en:
-        for candidate in [
-            node.css_first(".english"),
-            node.css_first(".chapter-title-english"),
-            node.css_first(".english_chapter_name"),
-            node.css_first(".chapter-title"),
-        ]:
-            title_en = text_content(candidate)
-            if title_en:
-                break
-
-    title_ar = text_content(node.css_first(".arabicchapter"))
-    if not title_ar:
-        for candidate in [
-            node.css_first(".arabic"),
-            node.css_first(".chapter-title-arabic"),
-            node.css_first(".arabic_chapter_name"),
-            node.css_first("span[dir='rtl']"),
-        ]:
-            title_ar = text_content(candidate)
-            if title_ar:
-                break
 
+    title_ar = text_content(node.css_first(_AR_CHAPTER_TITLE_SEL))
+
+    # Every hadith under this chapter repeats these fields; interning keeps
+    # one canonical object per value across the records list.
     return ChapterContext(
-        identifier=identifier,
-        number_en=number_en,
-        number_ar=number_ar,
-        title_en=title_en,
-        title_ar=title_ar,
+        identifier=sys.intern(identifier) if identifier else identifier,
+        number_en=sys.intern(number_en) if number_en else number_en,
+        number_ar=sys.intern(number_ar) if number_ar else number_ar,
+        title_en=sys.intern(title_en) if title_en else title_en,
+        title_ar=sys.intern(title_ar) if title_ar else title_ar,
     )
 
 
@@ -151,7 +184,7 @@ def parse_hadith_container(
 ) -> Optional[HadithRecord]:
     hadith_id = container.attributes.get("id")
     if hadith_id is None:
-        anchor = container.css_first("a[name]")
+        anchor = container.css_first(_NAMED_ANCHOR_SEL)
         if anchor is not None:
             hadith_id = anchor.attributes.get("name")
     if hadith_id is None:
@@ -168,23 +201,44 @@ def parse_hadith_container(
 
     narrator = text_content(container.css_first(".hadith_narrated"))
 
-    hadith_num_global = text_content(container.css_first(".hadith_number"))
+    # One subtree walk finds both number candidates; precedence still goes
+    # to .hadith_number over the sticky header.
+    number_node = sticky_node = None
+    for candidate in container.css(_HADITH_NUM_SEL):
+        tokens = (candidate.attributes.get("class") or "").split()
+        if "hadith_number" in tokens:
+            if number_node is None:
+                number_node = candidate
+        elif sticky_node is None:
+            sticky_node = candidate
+    hadith_num_global = text_content(number_node)
     if not hadith_num_global:
-        sticky = text_content(container.css_first(".hadith_reference_sticky"))
+        sticky = text_content(sticky_node)
         if sticky:
             hadith_num_global = normalize_text(sticky)
     hadith_num_in_book = text_content(container.css_first(".hadith_reference .bookReference"))
 
     grading_entries: list[GradingEntry] = []
-    for row in container.css(".hadith_grade, .hadith_rating"):
-        scholar = text_content(row.css_first(".gradeby")) or text_content(row.css_first("strong"))
-        grade = text_content(row.css_first(".grade"))
-        note = text_content(row.css_first(".grader_comment"))
+    for row in container.css(_GRADE_ROW_SEL):
+        # One pass over the row collects all four part candidates instead
+        # of a separate descendant walk per field.
+        scholar = strong = grade = note = None
+        for part in row.css(_GRADE_PARTS_SEL):
+            tokens = (part.attributes.get("class") or "").split()
+            if "gradeby" in tokens:
+                scholar = scholar or text_content(part)
+            elif "grade" in tokens:
+                grade = grade or text_content(part)
+            elif "grader_comment" in tokens:
+                note = note or text_content(part)
+            elif part.tag == "strong":
+                strong = strong or text_content(part)
+        scholar = scholar or strong
         if scholar or grade or note:
             grading_entries.append(GradingEntry(scholar=scholar or "Unknown", grade=grade, note=note))
 
     references: list[ReferenceEntry] = []
-    for table in container.css("table.hadith_reference"):
+    for table in container.css(_REFERENCE_TABLE_SEL):
         for row in table.css("tr"):
             cells = row.css("td")
             if len(cells) < 2:
@@ -203,13 +257,16 @@ def parse_hadith_container(
             elif "reference" in lower_label and "in-book" not in lower_label:
                 hadith_num_global = hadith_num_global or value
 
-    topics = [text for text in (text_content(node) for node in container.css(".hadith_topics span")) if text]
+    topics = [text for text in (text_content(node) for node in container.css(_TOPIC_SEL)) if text]
 
-    footnotes = [text for text in (text_content(node) for node in container.css(".footnote")) if text]
+    footnotes = [text for text in (text_content(node) for node in _by_class(container, "footnote")) if text]
 
-    source_url = f"{base_url}#{hadith_id}"
+    source_url = HttpUrl(f"{base_url}#{hadith_id}")
 
-    return HadithRecord(
+    # Every field here comes from this parser, so model_construct skips the
+    # per-record validation pass; the URL keeps its own check since it is
+    # the one field a malformed page could corrupt.
+    return HadithRecord.model_construct(
         collection_slug=collection_slug,
         collection_name=collection_name,
         book_id=book_id,
@@ -237,7 +294,7 @@ def parse_hadith_container(
 
 
 def parse_book_page(
-    html: str,
+    html: str | bytes,
     *,
     collection_slug: str,
     collection_name: str,
@@ -252,7 +309,7 @@ def parse_book_page(
     book_title_ar = None
     book_number = None
 
-    book_info = root.css_first(".book_info .book_page_colindextitle")
+    book_info = root.css_first(_BOOK_INFO_SEL)
     if book_info is not None:
         book_title_en = text_content(book_info.css_first(".book_page_english_name"))
         book_title_ar = text_content(book_info.css_first(".book_page_arabic_name"))
@@ -272,6 +329,15 @@ def parse_book_page(
 
     book_title_en = book_title_en or fallback_book_title_en or ""
     book_title_en = normalize_text(book_title_en) or book_title_en
+    # Book-level fields repeat on every record of the book; intern them so
+    # the hundreds of records share one object and equality is a pointer
+    # comparison downstream.
+    collection_slug = sys.intern(collection_slug)
+    collection_name = sys.intern(collection_name)
+    book_id = sys.intern(book_id)
+    book_title_en = sys.intern(book_title_en)
+    if book_title_ar:
+        book_title_ar = sys.intern(book_title_ar)
 
     all_hadith_container = root.css_first(".AllHadith")
     if all_hadith_container is None:
@@ -282,30 +348,29 @@ def parse_book_page(
     chapter = ChapterContext(identifier=None, number_en=None, number_ar=None, title_en=None, title_ar=None)
     pending_anchor: Optional[str] = None
 
-    node = all_hadith_container.child
-    while node is not None:
-        if node.tag == "a" and "name" in node.attributes:
+    for node in all_hadith_container.css(_BOOK_STREAM_SEL):
+        # The old sibling walk only looked at direct children; keep that
+        # scope so anchors nested inside containers stay invisible here.
+        if node.parent != all_hadith_container:
+            continue
+        if node.tag == "a":
             pending_anchor = node.attributes.get("name")
-        elif node.tag == "div":
-            classes = node.attributes.get("class", "") or ""
-            class_tokens = set(classes.split())
-            if "chapter" in class_tokens:
-                chapter = parse_chapter_node(node, fallback_anchor=pending_anchor)
-                pending_anchor = None
-            elif "actualHadithContainer" in class_tokens:
-                record = parse_hadith_container(
-                    node,
-                    collection_slug=collection_slug,
-                    collection_name=collection_name,
-                    book_id=book_id,
-                    book_title_en=book_title_en,
-                    book_title_ar=book_title_ar,
-                    chapter=chapter,
-                    base_url=book_url,
-                )
-                if record:
-                    hadith_records.append(record)
-        node = node.next
+        elif "actualHadithContainer" in (node.attributes.get("class") or ""):
+            record = parse_hadith_container(
+                node,
+                collection_slug=collection_slug,
+                collection_name=collection_name,
+                book_id=book_id,
+                book_title_en=book_title_en,
+                book_title_ar=book_title_ar,
+                chapter=chapter,
+                base_url=book_url,
+            )
+            if record:
+                hadith_records.append(record)
+        else:
+            chapter = parse_chapter_node(node, fallback_anchor=pending_anchor)
+            pending_anchor = None
 
     if not hadith_records:
         LOGGER.warning("No hadith parsed for book %s", book_id)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Iterable
 
+import orjson
+
 from .models import BookIndexEntry, HadithRecord
 
 
@@ -15,21 +16,26 @@ def ensure_parent(path: Path) -> None:
 
 def write_book_records(records: Iterable[HadithRecord], path: Path) -> int:
     ensure_parent(path)
-    count = 0
-    with path.open("w", encoding="utf-8") as handle:
-        for record in records:
-            handle.write(record.model_dump_json())
-            handle.write("\n")
-            count += 1
-    return count
+    # Serialize the whole book with orjson and land it in one write instead
+    # of two text-mode writes per record.
+    lines = [
+        orjson.dumps(record.model_dump(mode="json"), option=orjson.OPT_APPEND_NEWLINE)
+        for record in records
+    ]
+    with path.open("wb") as handle:
+        handle.writelines(lines)
+    return len(lines)
 
 
 def write_book_index(entries: Iterable[BookIndexEntry], path: Path) -> None:
     ensure_parent(path)
     payload = [entry.model_dump(mode="json") for entry in entries]
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
 
 
-def write_html_snapshot(html: str, path: Path) -> None:
+def write_html_snapshot(html: str | bytes, path: Path) -> None:
     ensure_parent(path)
-    path.write_text(html, encoding="utf-8")
+    if isinstance(html, bytes):
+        path.write_bytes(html)
+    else:
+        path.write_text(html, encoding="utf-8")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from mcp_server.apps import scoring
+
+
+CASES = [
+    # (text, groups, expected covered count)
+    ("the heart of the matter", [["art", "craft"]], 0),
+    ("art and craft", [["art", "craft"]], 1),
+    ("mercy and compassion", [["mercy"], ["compassion", "kindness"]], 2),
+    ("merciful acts", [["mercy"], ["compassion"]], 0),
+    ("art, then more art", [["art"], ["heart"]], 1),
+    ("", [["art"]], 0),
+]
+
+
+def _coverage(text: str, groups) -> int:
+    prepared = scoring.prepare_synonym_groups(groups)
+    lower = text.lower()
+    tokens = scoring._simple_tokenize(lower)
+    return scoring._covered_groups(tokens, lower, prepared)
+
+
+class CoveredGroupsTests(unittest.TestCase):
+    def test_whole_token_semantics(self) -> None:
+        for text, groups, expected in CASES:
+            with self.subTest(text=text):
+                self.assertEqual(_coverage(text, groups), expected)
+
+    def test_automaton_matches_fallback(self) -> None:
+        # Whatever backend is installed, the optional pyahocorasick path
+        # must report the same coverage as the token-set fallback.
+        for text, groups, expected in CASES:
+            with self.subTest(text=text):
+                fast = _coverage(text, groups)
+                with patch.object(scoring, "ahocorasick", None):
+                    scoring._group_automaton.cache_clear()
+                    fallback = _coverage(text, groups)
+                scoring._group_automaton.cache_clear()
+                self.assertEqual(fast, fallback)
+
+
+if __name__ == "__main__":
+    unittest.main()